@@ -6,6 +6,11 @@ Main entry point for Seed-X Translation Application
 import sys
 import os
 
+# Reduce CUDA allocator fragmentation across model reloads; must be set before torch is imported.
+# Expandable segments are not supported on Windows, and a value the user set is left alone.
+if sys.platform != "win32" and "PYTORCH_ALLOC_CONF" not in os.environ:
+    os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
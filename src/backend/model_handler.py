@@ -3,20 +3,40 @@ Model handler for Seed-X GGUF translation model
 """
 
 import os
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Tuple, Union
 from llama_cpp import Llama
-from src.utils.config import MODEL_CONFIG, GENERATION_CONFIG, LANGUAGES
+from src.utils.config import (
+    MODEL_CONFIG,
+    GENERATION_CONFIG,
+    LANGUAGES,
+    GenParams,
+    LANGUAGE_CODE_BY_NAME,
+    LANGUAGE_NAME_BY_CODE,
+)
+
+# Standard translation prompt
+_STD_TPL = "Translate the following {sn} text into {tn}:\n{t} <{tc}>"
+# Chain-of-Thought prompt for detailed translation
+_COT_TPL = "Translate the following {sn} text into {tn} and explain it in detail:\n{t} <{tc}>"
 
 
 class TranslationModel:
     """Handler for Seed-X translation model"""
 
+    # Maximum number of deterministic translations kept in memory
+    CACHE_SIZE = 256
+
     def __init__(self, model_path: Optional[str] = None):
         self.model = None
         self.model_path = model_path
         self.is_loaded = False
-        self.current_settings = GENERATION_CONFIG.copy()
+        self.current_settings = dict(GENERATION_CONFIG)
+        self._gen_params = GenParams.from_settings(self.current_settings)
         self.last_error = ""
+        self._cache: OrderedDict = OrderedDict()
+        self._tokenizer_pool: Optional[ThreadPoolExecutor] = None  # Created by batch_translate
 
         # Don't auto-load model in constructor to avoid crashes
         # Model will be loaded explicitly through GUI
@@ -32,6 +52,9 @@ class TranslationModel:
         Returns:
             bool: True if model loaded successfully, False otherwise
         """
+        # Cached translations belong to the previously loaded model
+        self._cache.clear()
+
         try:
             # Check if file exists
             if not os.path.exists(model_path):
@@ -41,8 +64,7 @@ class TranslationModel:
                 return False
 
             # Merge default config with provided kwargs
-            config = MODEL_CONFIG.copy()
-            config.update(kwargs)
+            config = {**MODEL_CONFIG, **kwargs}
 
             # For BF16 models, abort with a clear error (llama.cpp BF16 GGUF is unstable on Windows)
             if "bf16" in model_path.lower():
@@ -55,6 +77,10 @@ class TranslationModel:
                 self.last_error = msg
                 return False
 
+            # Don't ask for more GPU layers than fit into free VRAM
+            if config.get("n_gpu_layers", -1) == -1:
+                config["n_gpu_layers"] = self._auto_tune_ngl(model_path)
+
             print(f"Loading model: {model_path}")
             print(
                 f"Config: n_ctx={config.get('n_ctx')}, n_gpu_layers={config.get('n_gpu_layers')}, n_threads={config.get('n_threads')}"
@@ -66,6 +92,11 @@ class TranslationModel:
                 n_ctx=config.get("n_ctx", 2048),
                 n_threads=config.get("n_threads", 8),
                 n_gpu_layers=config.get("n_gpu_layers", -1),
+                n_batch=config.get("n_batch", 512),
+                use_mmap=config.get("use_mmap", True),
+                use_mlock=config.get("use_mlock", False),
+                offload_kqv=config.get("offload_kqv", True),
+                flash_attn=config.get("flash_attn", True),
                 seed=config.get("seed", -1),
                 verbose=config.get("verbose", True),  # Enable verbose for debugging
             )
@@ -107,14 +138,79 @@ class TranslationModel:
             self.is_loaded = False
             return False
 
+    def _auto_tune_ngl(self, model_path: str, reserve_mb: int = 1024) -> int:
+        """
+        Pick the largest n_gpu_layers that fits into free VRAM
+
+        Args:
+            model_path: Path to the GGUF model file
+            reserve_mb: VRAM to keep free for the KV cache and scratch buffers
+
+        Returns:
+            int: Number of layers to offload, or -1 to offload all of them
+        """
+        try:
+            import pynvml
+        except ImportError:
+            return -1
+
+        try:
+            pynvml.nvmlInit()
+            try:
+                free_bytes = pynvml.nvmlDeviceGetMemoryInfo(pynvml.nvmlDeviceGetHandleByIndex(0)).free
+            finally:
+                pynvml.nvmlShutdown()
+
+            # Read the layer count from GGUF metadata without loading the weights
+            probe = Llama(model_path=model_path, vocab_only=True, verbose=False)
+            arch = probe.metadata.get("general.architecture", "llama")
+            n_layers = int(probe.metadata.get(f"{arch}.block_count", 0))
+            del probe
+        except Exception as e:
+            print(f"Could not probe VRAM, offloading all layers: {e}")
+            return -1
+
+        if n_layers <= 0:
+            return -1
+
+        budget = free_bytes - reserve_mb * 1024 * 1024
+        layer_bytes = os.path.getsize(model_path) / n_layers
+        if budget >= layer_bytes * n_layers:
+            return -1
+
+        # Binary search the layer count; cost grows linearly with layers offloaded
+        low, high = 0, n_layers
+        while low < high:
+            mid = (low + high + 1) // 2
+            if mid * layer_bytes <= budget:
+                low = mid
+            else:
+                high = mid - 1
+
+        print(f"Free VRAM {free_bytes // (1024 * 1024)} MB fits {low}/{n_layers} layers")
+        return low
+
     def unload_model(self):
         """Unload the current model to free memory"""
         if self.model:
             del self.model
             self.model = None
             self.is_loaded = False
-
-    def translate(self, text: str, source_lang: str, target_lang: str, use_cot: bool = False, **kwargs) -> str:
+        self._cache.clear()
+        if self._tokenizer_pool is not None:
+            self._tokenizer_pool.shutdown(wait=False)
+            self._tokenizer_pool = None
+
+    def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        use_cot: bool = False,
+        stream: bool = True,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ) -> str:
         """
         Translate text from source to target language
 
@@ -123,6 +219,8 @@ class TranslationModel:
             source_lang: Source language code
             target_lang: Target language code
             use_cot: Use Chain-of-Thought mode for detailed translation
+            stream: Stream tokens from llama.cpp and stop as soon as a stop sequence appears
+            progress_callback: Optional callback receiving the partial translation while streaming
             **kwargs: Additional generation parameters
 
         Returns:
@@ -131,93 +229,164 @@ class TranslationModel:
         if not self.is_loaded or not self.model:
             raise RuntimeError("Model not loaded. Please load a model first.")
 
-        # Get language codes
-        source_code = self._get_language_code(source_lang)
-        target_code = self._get_language_code(target_lang)
+        # Resolve language codes and names
+        source_code, source_name = self._resolve_lang(source_lang)
+        target_code, target_name = self._resolve_lang(target_lang)
 
         # Build the prompt
-        prompt = self._build_prompt(text, source_code, target_code, use_cot)
+        prompt = self._build_prompt(text, source_name, target_name, target_code, use_cot)
 
         # Merge generation settings
-        gen_config = self.current_settings.copy()
-        gen_config.update(kwargs)
+        gen_params = self._gen_params.merged(kwargs)
+
+        return self._translate_prompt(
+            prompt, text, source_code, target_code, use_cot, gen_params, stream=stream, progress_callback=progress_callback
+        )
+
+    def _translate_prompt(
+        self,
+        prompt: Union[str, List[int]],
+        text: str,
+        source_code: str,
+        target_code: str,
+        use_cot: bool,
+        gen_params: GenParams,
+        stream: bool = True,
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Run generation for an already built (or tokenized) prompt"""
+        # Deterministic requests can be answered from the cache
+        cache_key = self._cache_key(text, source_code, target_code, use_cot, gen_params)
+        if cache_key is not None:
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                return cached
+
+        # The model starting a new source-language segment also means the translation is done
+        stop = list(gen_params.stop) + [f"<{source_code}>"]
+        params = {
+            "max_tokens": gen_params.max_tokens,
+            "temperature": gen_params.temperature,
+            "top_p": gen_params.top_p,
+            "top_k": gen_params.top_k,
+            "repeat_penalty": gen_params.repeat_penalty,
+            "stop": stop,
+        }
 
         try:
-            # Generate translation
-            response = self.model(
-                prompt,
-                max_tokens=gen_config.get("max_tokens", 512),
-                temperature=gen_config.get("temperature", 0.1),
-                top_p=gen_config.get("top_p", 0.95),
-                top_k=gen_config.get("top_k", 40),
-                repeat_penalty=gen_config.get("repeat_penalty", 1.1),
-                stop=gen_config.get("stop", ["</s>", "\n\n"]),
-            )
+            if not stream:
+                # Generate translation in one call
+                response = self.model(prompt, **params)
+                translation = response["choices"][0]["text"].strip()
+                if cache_key is not None:
+                    self._cache_store(cache_key, translation)
+                return translation
+
+            # Generate translation token by token
+            longest_stop = max(len(s) for s in stop)
+            generated = ""
+            for chunk in self.model(prompt, stream=True, **params):
+                piece = chunk["choices"][0]["text"]
+                generated += piece
+
+                # Only the new piece plus a stop-sized suffix can contain a fresh stop sequence
+                cut = self._find_stop(generated, stop, len(generated) - len(piece) - longest_stop)
+                if cut >= 0:
+                    generated = generated[:cut]
+                    break
+
+                if progress_callback:
+                    progress_callback(generated.strip())
 
             # Extract the translated text
-            translation = response["choices"][0]["text"].strip()
+            translation = generated.strip()
+            if cache_key is not None:
+                self._cache_store(cache_key, translation)
             return translation
 
         except Exception as e:
             return f"Translation error: {str(e)}"
 
-    def _build_prompt(self, text: str, source_lang: str, target_lang: str, use_cot: bool) -> str:
+    def _tokenize(self, prompt: str) -> List[int]:
+        """Tokenize a prompt the same way llama.cpp does for a text completion"""
+        return self.model.tokenize(prompt.encode("utf-8"), add_bos=True, special=True)
+
+    def _prepare_prompt(
+        self, text: str, source_name: str, target_name: str, target_code: str, use_cot: bool
+    ) -> Union[str, List[int]]:
+        """Build and tokenize a prompt, falling back to the text prompt if tokenizing fails"""
+        prompt = self._build_prompt(text, source_name, target_name, target_code, use_cot)
+        try:
+            return self._tokenize(prompt)
+        except Exception:
+            return prompt  # Let llama.cpp tokenize the text prompt itself
+
+    def _cache_key(self, text: str, source_code: str, target_code: str, use_cot: bool, gen_params: GenParams):
+        """Build the translation cache key, or None when sampling makes the output non-deterministic"""
+        if gen_params.temperature > 0:
+            return None
+        return (text, source_code, target_code, use_cot, gen_params)
+
+    def _cache_lookup(self, key) -> Optional[str]:
+        """Return a cached translation and mark it as recently used"""
+        translation = self._cache.get(key)
+        if translation is not None:
+            self._cache.move_to_end(key)
+        return translation
+
+    def _cache_store(self, key, translation: str):
+        """Store a translation, evicting the least recently used entry when full"""
+        self._cache[key] = translation
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _find_stop(text: str, stop: List[str], start: int) -> int:
+        """Return the index of the earliest stop sequence in text at or after start, or -1"""
+        start = max(0, start)
+        hits = [index for index in (text.find(s, start) for s in stop) if index >= 0]
+        return min(hits) if hits else -1
+
+    def _build_prompt(self, text: str, source_name: str, target_name: str, target_code: str, use_cot: bool) -> str:
         """
         Build the translation prompt according to model requirements
 
         Args:
             text: Text to translate
-            source_lang: Source language code
-            target_lang: Target language code
+            source_name: Source language name
+            target_name: Target language name
+            target_code: Target language code
             use_cot: Use Chain-of-Thought mode
 
         Returns:
             str: Formatted prompt
         """
-        # Get full language names
-        source_name = self._get_language_name(source_lang)
-        target_name = self._get_language_name(target_lang)
-
-        if use_cot:
-            # Chain-of-Thought prompt for detailed translation
-            prompt = f"Translate the following {source_name} text into {target_name} and explain it in detail:\n{text} <{target_lang}>"
-        else:
-            # Standard translation prompt
-            prompt = f"Translate the following {source_name} text into {target_name}:\n{text} <{target_lang}>"
-
-        return prompt
-
-    def _get_language_code(self, lang: str) -> str:
-        """Get language code from language name or code"""
-        # If it's already a code, return it
-        if lang in LANGUAGES.values():
-            return lang
-
-        # If it's a language name, get the code
-        for name, code in LANGUAGES.items():
-            if name.lower() == lang.lower():
-                return code
+        template = _COT_TPL if use_cot else _STD_TPL
+        return template.format_map({"sn": source_name, "tn": target_name, "t": text, "tc": target_code})
+
+    def _resolve_lang(self, lang: str) -> Tuple[str, str]:
+        """Resolve a language name or code to its (code, name) pair"""
+        # Exact language name
+        code = LANGUAGES.get(lang)
+        if code is not None:
+            return code, lang
+
+        # Language code, or a name in different case
+        lower = lang.lower()
+        name = LANGUAGE_NAME_BY_CODE.get(lower)
+        if name is not None:
+            return lower, name
+        code = LANGUAGE_CODE_BY_NAME.get(lower)
+        if code is not None:
+            return code, LANGUAGE_NAME_BY_CODE[code]
 
         # Default to the input if not found
-        return lang.lower()
-
-    def _get_language_name(self, lang: str) -> str:
-        """Get language name from code or name"""
-        # If it's a language name, return it
-        if lang in LANGUAGES:
-            return lang
-
-        # If it's a code, get the name
-        for name, code in LANGUAGES.items():
-            if code == lang.lower():
-                return name
-
-        # Default to the input if not found
-        return lang
+        return lower, lang
 
     def update_settings(self, settings: Dict[str, Any]):
         """Update generation settings"""
         self.current_settings.update(settings)
+        self._gen_params = GenParams.from_settings(self.current_settings)
 
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model"""
@@ -248,9 +417,27 @@ class TranslationModel:
         Returns:
             List[str]: List of translated texts
         """
+        if not self.is_loaded or not self.model:
+            raise RuntimeError("Model not loaded. Please load a model first.")
+
+        source_code, source_name = self._resolve_lang(source_lang)
+        target_code, target_name = self._resolve_lang(target_lang)
+
+        gen_params = self._gen_params.merged(kwargs)
+
+        # Build and tokenize upcoming prompts on the pool while the single Llama instance generates
+        if self._tokenizer_pool is None:
+            self._tokenizer_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gguf-tokenize")
+        futures = [
+            self._tokenizer_pool.submit(self._prepare_prompt, text, source_name, target_name, target_code, use_cot)
+            for text in texts
+        ]
+
         translations = []
-        for text in texts:
-            translation = self.translate(text, source_lang, target_lang, use_cot, **kwargs)
-            translations.append(translation)
+        for text, future in zip(texts, futures):
+            # Nothing consumes partial output here, so skip the per-token streaming loop
+            translations.append(
+                self._translate_prompt(future.result(), text, source_code, target_code, use_cot, gen_params, stream=False)
+            )
 
         return translations
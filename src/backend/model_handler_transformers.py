@@ -2,32 +2,100 @@
 Model handler using Transformers library (works on Windows)
 """
 
+import contextlib
+import functools
+import gc
+import importlib.util
 import os
 import re
-from typing import Any, Dict, List, Optional
-
-import torch
-from huggingface_hub import snapshot_download
-from transformers import AutoModelForCausalLM, AutoTokenizer
-
-from src.utils.config import GENERATION_CONFIG, LANGUAGES
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Must be set before tokenizers is imported; the app uses threads, not fork
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+import torch  # noqa: E402
+from huggingface_hub import snapshot_download  # noqa: E402
+from transformers import (  # noqa: E402
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    BitsAndBytesConfig,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextIteratorStreamer,
+)
+
+from src.utils.config import GENERATION_CONFIG, LANGUAGES, GenParams, LANGUAGE_CODE_BY_NAME, LANGUAGE_NAME_BY_CODE  # noqa: E402
+
+# Written into a model directory once snapshot_download has finished
+DOWNLOAD_COMPLETE_MARKER = ".seedx_complete"
+
+# Simplified prompt for better results
+_STD_TPL = "Translate from {sn} to {tn}:\n{t}\n\nTranslation in {tn} <{tc}>:"
+# Chain-of-Thought prompt for detailed translation
+_COT_TPL = "Translate the following {sn} text into {tn} and explain it in detail:\n{t} <{tc}>"
+
+# Any two-letter language marker such as <en> or <pl>
+_LANG_MARKER = re.compile(r"<[a-z]{2}>", re.IGNORECASE)
+# Leading "Label:" prefix left over after the fallback split
+_LEADING_LABEL = re.compile(r"^[a-zA-Z]+:")
+
+
+@functools.lru_cache(maxsize=64)
+def _compiled_patterns(target_code: str):
+    """Compile the extraction patterns for a target language code once"""
+    code = re.escape(target_code)
+    flags = re.DOTALL | re.IGNORECASE
+    # A proper "<code>" marker always wins; a bare "code>" is only tried when it yields nothing
+    tagged = re.compile(f"<{code}>(.*?)(?:<(?!/)|$)", flags)
+    bare = re.compile(f"{code}>(.*?)(?:<|$)", flags)
+    split = re.compile(f"<{code}>|{code}>")
+    return (tagged, bare), split
+
+
+class _TranslationStop(StoppingCriteria):
+    """Stop a sequence once its new text hits a stop string or opens another language segment"""
+
+    def __init__(self, tokenizer, prompt_length: int, stop: List[str], window: int = 8):
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.stop = [s for s in stop if s]
+        self.window = window
+
+    def __call__(self, input_ids, scores, **kwargs):
+        # Only the last few generated tokens can contain a fresh stop
+        start = max(self.prompt_length, input_ids.shape[1] - self.window)
+        tails = self.tokenizer.batch_decode(input_ids[:, start:], skip_special_tokens=True)
+        done = [any(s in tail for s in self.stop) or _LANG_MARKER.search(tail) is not None for tail in tails]
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
 
 
 class TransformersTranslationModel:
     """Handler for Seed-X translation model using Transformers library"""
 
+    # Maximum number of deterministic translations kept in memory
+    CACHE_SIZE = 256
+
     def __init__(self, model_path: Optional[str] = None):
         self.model = None
         self.tokenizer = None
         self.model_path = model_path
         self.is_loaded = False
-        self.current_settings = GENERATION_CONFIG.copy()
+        self.current_settings = dict(GENERATION_CONFIG)
+        self._gen_params = GenParams.from_settings(self.current_settings)
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._cache: OrderedDict = OrderedDict()
 
     def ensure_model_downloaded(self, model_path: str, repo_id: str = "ByteDance/Seed-X-PPO-7B") -> bool:
         """
         Ensure model is downloaded, auto-download if not exists
         """
+        # A finished snapshot leaves a marker file; no need to look any further
+        if (Path(model_path) / DOWNLOAD_COMPLETE_MARKER).exists():
+            return True
+
         if not os.path.exists(model_path):
             print(f"Model directory does not exist: {model_path}")
             print(f"Downloading model from Hugging Face: {repo_id}")
@@ -35,8 +103,16 @@ class TransformersTranslationModel:
                 # Create parent directory
                 os.makedirs(os.path.dirname(model_path), exist_ok=True)
 
-                # Download model
-                snapshot_download(repo_id=repo_id, local_dir=model_path, local_dir_use_symlinks=False, resume_download=True)
+                # Download model, fetching shards in parallel
+                snapshot_download(
+                    repo_id=repo_id,
+                    local_dir=model_path,
+                    local_dir_use_symlinks=False,
+                    resume_download=True,
+                    max_workers=8,
+                    etag_timeout=10,
+                )
+                (Path(model_path) / DOWNLOAD_COMPLETE_MARKER).touch()
                 print(f"Model download completed: {model_path}")
                 return True
             except Exception as e:
@@ -46,17 +122,22 @@ class TransformersTranslationModel:
             print(f"Model already exists: {model_path}")
             return True
 
-    def load_model(self, model_path: str, **kwargs) -> bool:
+    def load_model(self, model_path: str, quantization: Optional[str] = "nf4", **kwargs) -> bool:
         """
         Load the model using Transformers
 
         Args:
             model_path: Path to the model directory
+            quantization: "nf4" (4-bit), "int8" or None for FP16; only applied on CUDA with bitsandbytes installed
             **kwargs: Additional model configuration parameters
+                (compile: set to False to skip torch.compile on CUDA)
 
         Returns:
             bool: True if model loaded successfully, False otherwise
         """
+        # Cached translations belong to the previously loaded model
+        self._cache.clear()
+
         try:
             print(f"Loading model with Transformers: {model_path}")
 
@@ -73,21 +154,41 @@ class TransformersTranslationModel:
             # Determine dtype
             dtype = torch.float16 if self.device == "cuda" else torch.float32
 
+            quantization_config = self._quantization_config(quantization)
+
             # Load model and tokenizer
-            print(f"Loading model to {self.device} with dtype {dtype}")
+            print(f"Loading model to {self.device} with dtype {dtype}, quantization: {quantization_config and quantization}")
             self.model = AutoModelForCausalLM.from_pretrained(
-                model_path, torch_dtype=dtype, device_map="auto" if self.device == "cuda" else None, trust_remote_code=True
+                model_path,
+                torch_dtype=dtype,
+                device_map="auto" if self.device == "cuda" else None,
+                trust_remote_code=True,
+                attn_implementation="sdpa",
+                quantization_config=quantization_config,
             )
 
+            # Inference only: drop dropout and autograd bookkeeping for the weights
+            self.model.eval()
+            self.model.requires_grad_(False)
+
             if self.device == "cuda":
-                self.model = self.model.to(self.device)
+                # bitsandbytes places quantized weights itself and rejects .to()
+                if quantization_config is None:
+                    self.model = self.model.to(self.device)
 
-            self.tokenizer = AutoTokenizer.from_pretrained(model_path, trust_remote_code=True)
+            self.tokenizer = AutoTokenizer.from_pretrained(model_path, use_fast=True, trust_remote_code=True)
 
             # Set pad token if not set
             if self.tokenizer.pad_token is None:
                 self.tokenizer.pad_token = self.tokenizer.eos_token
 
+            # Decoder-only models need left padding so batched prompts end at the same position
+            self.tokenizer.padding_side = "left"
+
+            # Compiling needs the tokenizer for its warm-up generation
+            if self.device == "cuda" and kwargs.get("compile", True):
+                self._compile_model()
+
             self.model_path = model_path
             self.is_loaded = True
             print(f"Model loaded successfully with Transformers on {self.device}!")
@@ -102,6 +203,71 @@ class TransformersTranslationModel:
             self.is_loaded = False
             return False
 
+    def _quantization_config(self, quantization: Optional[str]) -> Optional[BitsAndBytesConfig]:
+        """Build the bitsandbytes config for the requested quantization, or None to load in full precision"""
+        if not quantization or quantization == "none":
+            return None
+        if self.device != "cuda":
+            print("Quantization requires CUDA, loading in full precision")
+            return None
+        if importlib.util.find_spec("bitsandbytes") is None:
+            print("bitsandbytes is not installed, loading in full precision")
+            return None
+
+        if quantization == "nf4":
+            return BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=torch.float16,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_use_double_quant=True,
+            )
+        if quantization == "int8":
+            return BitsAndBytesConfig(load_in_8bit=True)
+
+        print(f"Unknown quantization '{quantization}', loading in full precision")
+        return None
+
+    def _compile_model(self):
+        """Compile the forward pass and switch generation to a static KV cache"""
+        version = tuple(int(part) for part in torch.__version__.split("+")[0].split(".")[:2])
+        if version < (2, 1):
+            print(f"torch {torch.__version__} is too old for torch.compile, skipping")
+            return
+
+        eager_forward = self.model.forward
+        eager_cache = self.model.generation_config.cache_implementation
+        try:
+            # generate() calls forward directly, so compile that instead of wrapping the module
+            self.model.forward = torch.compile(self.model.forward, mode="reduce-overhead", fullgraph=False)
+            # A preallocated cache keeps tensor shapes stable between decode steps
+            self.model.generation_config.cache_implementation = "static"
+            # torch.compile is lazy: missing Inductor/Triton or CUDA graph failures only surface on the first call
+            self._warm_up()
+            print("Model forward compiled with torch.compile (static KV cache)")
+        except Exception as e:
+            # The static cache only pays off with a compiled forward, so both go back together
+            self.model.forward = eager_forward
+            self.model.generation_config.cache_implementation = eager_cache
+            print(f"torch.compile unavailable, using eager mode: {e}")
+
+    def _warm_up(self):
+        """Run one tiny greedy generation so compilation happens, or fails, at load time"""
+        inputs = self.tokenizer("Translate from English to Polish:\nHello", return_tensors="pt").to(self.device)
+        with torch.inference_mode(), self._sdpa_context():
+            self.model.generate(**inputs, max_new_tokens=2, do_sample=False, pad_token_id=self.tokenizer.pad_token_id)
+
+    def _sdpa_context(self):
+        """Prefer the flash / memory-efficient SDPA kernels during generation on CUDA"""
+        if self.device != "cuda":
+            return contextlib.nullcontext()
+        try:
+            from torch.nn.attention import SDPBackend, sdpa_kernel
+
+            # Math stays enabled as a last resort for shapes the fused kernels reject
+            return sdpa_kernel([SDPBackend.FLASH_ATTENTION, SDPBackend.EFFICIENT_ATTENTION, SDPBackend.MATH])
+        except ImportError:
+            return torch.backends.cuda.sdp_kernel(enable_flash=True, enable_mem_efficient=True, enable_math=True)
+
     def unload_model(self):
         """Unload the current model to free memory"""
         if self.model:
@@ -111,41 +277,47 @@ class TransformersTranslationModel:
             del self.tokenizer
             self.tokenizer = None
         self.is_loaded = False
-        torch.cuda.empty_cache() if torch.cuda.is_available() else None
+        self._cache.clear()
+
+        # Collect the dropped tensors first so the caching allocator can actually release their blocks
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+            torch.cuda.empty_cache()
+            torch.cuda.reset_peak_memory_stats()
 
     def _extract_with_patterns(self, output: str, target_code: str) -> str:
-        """Extract translation using regex patterns"""
-        patterns = [
-            f"<{target_code}>(.*?)(?:<(?!/)|$)",
-            f"<{target_code}>(.*)",
-            f"{target_code}>(.*?)(?:<|$)",
-            f"<{target_code}>\\s*(.*?)(?:\\n\\n|$)",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, output, re.DOTALL | re.IGNORECASE)
-            if match:
-                result = match.group(1).strip()
-                if result and len(result) > 0:
-                    return result
-        return ""
+        """Extract translation using the precompiled marker patterns"""
+        (tagged, bare), _ = _compiled_patterns(target_code)
+
+        match = tagged.search(output)
+        if match:
+            # Segment up to the next tag, else everything after the marker
+            result = match.group(1).strip() or output[match.start(1) :].strip()
+            if result:
+                return result
+
+        match = bare.search(output)
+        return match.group(1).strip() if match else ""
 
     def _extract_line_by_line(self, output: str, target_code: str) -> str:
         """Extract translation by parsing line by line"""
+        _, split_pattern = _compiled_patterns(target_code)
+        marker = f"{target_code}>"
         lines = output.split("\n")
         found_marker = False
         result_lines = []
 
         for line in lines:
-            if f"<{target_code}>" in line or f"{target_code}>" in line:
+            if marker in line:
                 found_marker = True
-                parts = re.split(f"<{target_code}>|{target_code}>", line, 1)
+                parts = split_pattern.split(line, 1)
                 if len(parts) > 1 and parts[1].strip():
                     result_lines.append(parts[1].strip())
                 continue
 
             if found_marker:
-                if re.search(r"<[a-z]{2}>", line, re.IGNORECASE):
+                if _LANG_MARKER.search(line):
                     break
                 result_lines.append(line)
 
@@ -158,8 +330,8 @@ class TransformersTranslationModel:
             if len(parts) > 1:
                 result = parts[1].strip()
                 # Remove language markers
-                result = re.sub(r"<[a-z]{2}>", "", result, flags=re.IGNORECASE)
-                result = re.sub(r"^[a-zA-Z]+:", "", result).strip()
+                result = _LANG_MARKER.sub("", result)
+                result = _LEADING_LABEL.sub("", result).strip()
                 if result:
                     return result
         return ""
@@ -179,7 +351,15 @@ class TransformersTranslationModel:
         # Try fallback method
         return self._extract_fallback(output)
 
-    def translate(self, text: str, source_lang: str, target_lang: str, use_cot: bool = False, **kwargs) -> str:
+    def translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        use_cot: bool = False,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ) -> str:
         """
         Translate text from source to target language
 
@@ -188,6 +368,7 @@ class TransformersTranslationModel:
             source_lang: Source language code or name
             target_lang: Target language code or name
             use_cot: Use Chain-of-Thought mode for detailed translation
+            progress_callback: Optional callback receiving the partial translation while streaming
             **kwargs: Additional generation parameters
 
         Returns:
@@ -196,54 +377,52 @@ class TransformersTranslationModel:
         if not self.is_loaded or not self.model:
             raise RuntimeError("Model not loaded. Please load a model first.")
 
-        # Get language codes
-        target_code = self._get_language_code(target_lang)
-        source_name = self._get_language_name(source_lang)
-        target_name = self._get_language_name(target_lang)
+        # Resolve language codes and names
+        source_code, source_name = self._resolve_lang(source_lang)
+        target_code, target_name = self._resolve_lang(target_lang)
 
         # Build the prompt
-        if use_cot:
-            prompt = f"Translate the following {source_name} text into {target_name} and explain it in detail:\n{text} <{target_code}>"
-        else:
-            # Simplified prompt for better results
-            prompt = f"Translate from {source_name} to {target_name}:\n{text}\n\nTranslation in {target_name} <{target_code}>:"
+        prompt = self._build_prompt(text, source_name, target_name, target_code, use_cot)
 
         # Merge generation settings
-        gen_config = self.current_settings.copy()
-        gen_config.update(kwargs)
+        gen_params = self._gen_params.merged(kwargs)
+
+        # Deterministic requests can be answered from the cache
+        cache_key = self._cache_key(text, source_code, target_code, use_cot, gen_params)
+        if cache_key is not None:
+            cached = self._cache_lookup(cache_key)
+            if cached is not None:
+                return cached
 
         try:
             # Tokenize input
             inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
 
             # Calculate max tokens
-            max_tokens = min(gen_config.get("max_tokens", 512), max(150, len(text) * 2))
+            max_tokens = min(gen_params.max_tokens, max(150, len(text) * 2))
 
             print(f"Translating text (length: {len(text)}), max_tokens: {max_tokens}")
 
-            # Generate translation
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_new_tokens=max_tokens,
-                    temperature=gen_config.get("temperature", 0.1) if gen_config.get("temperature", 0.1) > 0 else 1.0,
-                    do_sample=gen_config.get("temperature", 0.1) > 0,
-                    top_p=gen_config.get("top_p", 0.95),
-                    top_k=gen_config.get("top_k", 40),
-                    repetition_penalty=gen_config.get("repeat_penalty", 1.1),
-                    pad_token_id=self.tokenizer.pad_token_id,
-                    eos_token_id=self.tokenizer.eos_token_id,
-                )
+            generate_kwargs = self._generation_kwargs(gen_params, max_tokens)
+            generate_kwargs["stopping_criteria"] = self._stopping_criteria(
+                inputs["input_ids"].shape[1], gen_params, [text], use_cot
+            )
+
+            if progress_callback:
+                # Stream tokens to the callback; the prompt is prepended so extraction sees the marker
+                full_output = prompt + self._generate_streaming(inputs, generate_kwargs, progress_callback)
+            else:
+                # Generate translation
+                with torch.inference_mode(), self._sdpa_context():
+                    outputs = self.model.generate(**inputs, **generate_kwargs)
 
-            # Decode output
-            full_output = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+                # Decode output
+                full_output = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
 
             # Extract translation
             translation = self.extract_translation_from_output(full_output, target_code)
 
-            if translation:
-                return translation
-            else:
+            if not translation:
                 # Fallback: remove the prompt from output
                 if prompt in full_output:
                     translation = full_output.replace(prompt, "").strip()
@@ -251,37 +430,118 @@ class TransformersTranslationModel:
                     translation = full_output
 
                 # Clean up any remaining markers
-                translation = re.sub(r"<[a-z]{2}>", "", translation, flags=re.IGNORECASE)
-                return translation if translation else "Translation failed"
+                translation = _LANG_MARKER.sub("", translation)
+                if not translation:
+                    return "Translation failed"
+
+            if cache_key is not None:
+                self._cache_store(cache_key, translation)
+            return translation
 
         except Exception as e:
             return f"Translation error: {str(e)}"
 
-    def _get_language_code(self, lang: str) -> str:
-        """Get language code from language name or code"""
-        if lang in LANGUAGES.values():
-            return lang
-
-        for name, code in LANGUAGES.items():
-            if name.lower() == lang.lower():
-                return code
-
-        return lang.lower()
-
-    def _get_language_name(self, lang: str) -> str:
-        """Get language name from code or name"""
-        if lang in LANGUAGES:
-            return lang
-
-        for name, code in LANGUAGES.items():
-            if code == lang.lower():
-                return name
+    def _stopping_criteria(
+        self, prompt_length: int, gen_params: GenParams, texts: List[str], use_cot: bool
+    ) -> StoppingCriteriaList:
+        """Build stopping criteria from the configured stop strings"""
+        stop = list(gen_params.stop)
+        # A blank line ends a plain one-paragraph translation, but not a CoT explanation or a multi-paragraph input
+        if use_cot or any("\n\n" in text for text in texts):
+            stop = [s for s in stop if s != "\n\n"]
+        return StoppingCriteriaList([_TranslationStop(self.tokenizer, prompt_length, stop)])
+
+    def _generate_streaming(self, inputs, generate_kwargs: Dict[str, Any], progress_callback: Callable[[str], None]) -> str:
+        """Run generate on a worker thread and feed the decoded text to progress_callback as it arrives"""
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        errors = []
+
+        def run():
+            try:
+                # inference_mode is thread-local, so it has to be entered on the generating thread
+                with torch.inference_mode(), self._sdpa_context():
+                    self.model.generate(**inputs, **generate_kwargs, streamer=streamer)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+
+        generated = ""
+        for piece in streamer:
+            generated += piece
+            partial = _LANG_MARKER.sub("", generated).strip()
+            if partial:
+                progress_callback(partial)
+
+        worker.join()
+        if errors:
+            raise errors[0]
+        return generated
+
+    def _build_prompt(self, text: str, source_name: str, target_name: str, target_code: str, use_cot: bool) -> str:
+        """Build the translation prompt for the Transformers backend"""
+        template = _COT_TPL if use_cot else _STD_TPL
+        return template.format_map({"sn": source_name, "tn": target_name, "t": text, "tc": target_code})
+
+    def _generation_kwargs(self, gen_params: GenParams, max_tokens: int) -> Dict[str, Any]:
+        """Build keyword arguments for model.generate from generation settings"""
+        temperature = gen_params.temperature
+        return {
+            "max_new_tokens": max_tokens,
+            "use_cache": True,
+            "temperature": temperature if temperature > 0 else 1.0,
+            "do_sample": temperature > 0,
+            "top_p": gen_params.top_p,
+            "top_k": gen_params.top_k,
+            "repetition_penalty": gen_params.repeat_penalty,
+            "pad_token_id": self.tokenizer.pad_token_id,
+            "eos_token_id": self.tokenizer.eos_token_id,
+        }
 
-        return lang
+    def _cache_key(self, text: str, source_code: str, target_code: str, use_cot: bool, gen_params: GenParams):
+        """Build the translation cache key, or None when sampling makes the output non-deterministic"""
+        if gen_params.temperature > 0:
+            return None
+        return (text, source_code, target_code, use_cot, gen_params)
+
+    def _cache_lookup(self, key) -> Optional[str]:
+        """Return a cached translation and mark it as recently used"""
+        translation = self._cache.get(key)
+        if translation is not None:
+            self._cache.move_to_end(key)
+        return translation
+
+    def _cache_store(self, key, translation: str):
+        """Store a translation, evicting the least recently used entry when full"""
+        self._cache[key] = translation
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _resolve_lang(self, lang: str) -> Tuple[str, str]:
+        """Resolve a language name or code to its (code, name) pair"""
+        # Exact language name
+        code = LANGUAGES.get(lang)
+        if code is not None:
+            return code, lang
+
+        # Language code, or a name in different case
+        lower = lang.lower()
+        name = LANGUAGE_NAME_BY_CODE.get(lower)
+        if name is not None:
+            return lower, name
+        code = LANGUAGE_CODE_BY_NAME.get(lower)
+        if code is not None:
+            return code, LANGUAGE_NAME_BY_CODE[code]
+
+        # Default to the input if not found
+        return lower, lang
 
     def update_settings(self, settings: Dict[str, Any]):
         """Update generation settings"""
         self.current_settings.update(settings)
+        self._gen_params = GenParams.from_settings(self.current_settings)
 
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model"""
@@ -297,24 +557,63 @@ class TransformersTranslationModel:
         }
 
     def batch_translate(
-        self, texts: List[str], source_lang: str, target_lang: str, use_cot: bool = False, **kwargs
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_lang: str,
+        use_cot: bool = False,
+        batch_size: int = 16,
+        **kwargs,
     ) -> List[str]:
         """
-        Translate multiple texts
+        Translate multiple texts, running each chunk of prompts through a single generate call
 
         Args:
             texts: List of texts to translate
             source_lang: Source language code
             target_lang: Target language code
             use_cot: Use Chain-of-Thought mode
+            batch_size: Maximum number of prompts per generate call (bounds VRAM usage)
             **kwargs: Additional generation parameters
 
         Returns:
             List[str]: List of translated texts
         """
+        if not self.is_loaded or not self.model:
+            raise RuntimeError("Model not loaded. Please load a model first.")
+
+        _, source_name = self._resolve_lang(source_lang)
+        target_code, target_name = self._resolve_lang(target_lang)
+
+        gen_params = self._gen_params.merged(kwargs)
+
         translations = []
-        for text in texts:
-            translation = self.translate(text, source_lang, target_lang, use_cot, **kwargs)
-            translations.append(translation)
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start : start + batch_size]
+            prompts = [self._build_prompt(text, source_name, target_name, target_code, use_cot) for text in chunk]
+
+            try:
+                inputs = self.tokenizer(prompts, return_tensors="pt", padding=True, truncation=True).to(self.device)
+                max_tokens = min(gen_params.max_tokens, max(150, max(len(text) for text in chunk) * 2))
+
+                print(f"Translating batch of {len(chunk)} texts, max_tokens: {max_tokens}")
+
+                generate_kwargs = self._generation_kwargs(gen_params, max_tokens)
+                generate_kwargs["stopping_criteria"] = self._stopping_criteria(
+                    inputs["input_ids"].shape[1], gen_params, chunk, use_cot
+                )
+
+                with torch.inference_mode(), self._sdpa_context():
+                    outputs = self.model.generate(**inputs, **generate_kwargs)
+
+                # Only decode the generated continuation; the prompt is identical to what was sent in
+                generated = self.tokenizer.batch_decode(outputs[:, inputs["input_ids"].shape[1] :], skip_special_tokens=True)
+                for output in generated:
+                    translation = self.extract_translation_from_output(output, target_code) or output
+                    translation = _LANG_MARKER.sub("", translation).strip()
+                    translations.append(translation if translation else "Translation failed")
+
+            except Exception as e:
+                translations.extend(f"Translation error: {str(e)}" for _ in chunk)
 
         return translations
@@ -4,11 +4,42 @@ Separates model handling, translation, and history from GUI
 """
 
 import json
-from typing import Optional, Dict, List
+import os
+import queue
+import time
+from collections import deque
+from typing import Optional, Dict, Deque, Iterable, List
 
-from PyQt6.QtCore import QThread, pyqtSignal, QSettings
+from PyQt6.QtCore import QObject, QThread, QThreadPool, pyqtSignal, QStandardPaths
 from src.backend.model_handler import TranslationModel
-from src.backend.model_handler_transformers import TransformersTranslationModel
+from src.backend.model_handler_transformers import DOWNLOAD_COMPLETE_MARKER, TransformersTranslationModel
+
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def _dumps_line(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    _loads = json.loads
+
+
+def _parse_history(data: bytes) -> Iterable[Dict]:
+    """Parse history file contents, either JSON Lines or a single JSON array"""
+    if data.lstrip()[:1] == b"[":
+        return _loads(data)
+    return (_loads(line) for line in data.splitlines() if line.strip())
 
 
 class ModelLoadThread(QThread):
@@ -17,14 +48,15 @@ class ModelLoadThread(QThread):
     progress = pyqtSignal(str)
     finished = pyqtSignal(bool)
 
-    def __init__(self, model_path: str, model_handler: TranslationModel):
+    def __init__(self, model_path: str, model_handler: TranslationModel, **kwargs):
         super().__init__()
         self.model_path = model_path
         self.model_handler = model_handler
+        self.kwargs = kwargs
 
     def run(self):
         self.progress.emit("Loading model...")
-        success = self.model_handler.load_model(self.model_path)
+        success = self.model_handler.load_model(self.model_path, **self.kwargs)
         if success:
             self.progress.emit("Model loaded successfully!")
         else:
@@ -32,12 +64,13 @@ class ModelLoadThread(QThread):
         self.finished.emit(success)
 
 
-class TranslationThread(QThread):
-    """Thread for running translation without blocking"""
+class TranslationJob(QObject):
+    """A queued translation request; its signals report back to the GUI thread"""
 
     result = pyqtSignal(str)
     error = pyqtSignal(str)
     progress = pyqtSignal(str)
+    partial = pyqtSignal(str)
 
     def __init__(
         self, model: TranslationModel, text: str, source_lang: str, target_lang: str, use_cot: bool = False, **kwargs
@@ -53,12 +86,35 @@ class TranslationThread(QThread):
     def run(self):
         try:
             self.progress.emit("Translating...")
-            translation = self.model.translate(self.text, self.source_lang, self.target_lang, self.use_cot, **self.kwargs)
+            translation = self.model.translate(
+                self.text,
+                self.source_lang,
+                self.target_lang,
+                self.use_cot,
+                progress_callback=self.partial.emit,
+                **self.kwargs,
+            )
             self.result.emit(translation)
         except Exception as e:
             self.error.emit(str(e))
 
 
+class TranslationWorker(QThread):
+    """Long-lived thread that runs queued translation jobs one at a time"""
+
+    def __init__(self, request_queue: queue.Queue):
+        super().__init__()
+        self.request_queue = request_queue
+
+    def run(self):
+        # A single worker also serializes access to the shared model instance
+        while True:
+            job = self.request_queue.get()
+            if job is None:
+                break
+            job.run()
+
+
 class ModelDownloadThread(QThread):
     """Thread for downloading models without blocking"""
 
@@ -92,8 +148,14 @@ class ModelDownloadThread(QThread):
                 self.progress.emit(f"Downloading repository {self.repo_id}...")
                 path_to_check = os.path.abspath(os.path.join("models", self.repo_id.split("/")[-1]))
                 snapshot_download(
-                    repo_id=self.repo_id, local_dir=path_to_check, local_dir_use_symlinks=False, repo_type="model"
+                    repo_id=self.repo_id,
+                    local_dir=path_to_check,
+                    local_dir_use_symlinks=False,
+                    repo_type="model",
+                    max_workers=8,
+                    etag_timeout=10,
                 )
+                open(os.path.join(path_to_check, DOWNLOAD_COMPLETE_MARKER), "a").close()
 
             if path_to_check and os.path.exists(path_to_check):
                 self.finished.emit(True, path_to_check)
@@ -108,11 +170,22 @@ class ModelDownloadThread(QThread):
 class TranslationManager:
     """Manages translation logic, model, and history"""
 
+    # Number of history entries kept; older ones are dropped
+    MAX_HISTORY = 50
+    # Session logs kept in the cache directory, and the size at which one is compacted
+    SESSION_HISTORY_FILES = 10
+    SESSION_HISTORY_MAX_BYTES = 4 * 1024 * 1024
+
     def __init__(self):
         self.model = None
-        self.translation_history: List[Dict] = []
-        self.settings = QSettings("SeedX", "Translator")
+        self.translation_history: Deque[Dict] = deque(maxlen=self.MAX_HISTORY)
         self.current_backend = "GGUF"
+        self._request_queue: queue.Queue = queue.Queue()
+        self._worker: Optional[TranslationWorker] = None
+        self._session_history_path: Optional[str] = None  # JSONL log of this session, created on first entry
+        # A single thread keeps session log writes off the GUI thread and in order
+        self._session_pool = QThreadPool()
+        self._session_pool.setMaxThreadCount(1)
 
     def switch_backend(self, backend: str):
         """Switch between backends"""
@@ -124,9 +197,9 @@ class TranslationManager:
             self.model = TranslationModel()
         self.current_backend = backend
 
-    def load_model(self, model_path: str, progress_callback, finished_callback):
+    def load_model(self, model_path: str, progress_callback, finished_callback, **kwargs):
         """Load model in thread"""
-        thread = ModelLoadThread(model_path, self.model)
+        thread = ModelLoadThread(model_path, self.model, **kwargs)
         thread.progress.connect(progress_callback)
         thread.finished.connect(finished_callback)
         thread.start()
@@ -142,14 +215,21 @@ class TranslationManager:
         result_callback,
         error_callback,
         progress_callback,
+        partial_callback=None,
     ):
-        """Perform translation in thread"""
-        thread = TranslationThread(self.model, text, source_lang, target_lang, use_cot, **settings)
-        thread.result.connect(result_callback)
-        thread.error.connect(error_callback)
-        thread.progress.connect(progress_callback)
-        thread.start()
-        return thread
+        """Queue a translation for the worker thread"""
+        job = TranslationJob(self.model, text, source_lang, target_lang, use_cot, **settings)
+        job.result.connect(result_callback)
+        job.error.connect(error_callback)
+        job.progress.connect(progress_callback)
+        if partial_callback:
+            job.partial.connect(partial_callback)
+
+        if self._worker is None:
+            self._worker = TranslationWorker(self._request_queue)
+            self._worker.start()
+        self._request_queue.put(job)
+        return job
 
     def download_model(self, repo_id: str, filename: Optional[str], progress_callback, finished_callback):
         """Download model in thread"""
@@ -161,37 +241,119 @@ class TranslationManager:
 
     def add_to_history(self, entry: Dict):
         """Add entry to history"""
+        # deque(maxlen=...) drops the oldest entry once full
         self.translation_history.append(entry)
-        # Limit size
-        max_history = 50  # Configurable
-        if len(self.translation_history) > max_history:
-            self.translation_history.pop(0)
-
-    def get_history(self) -> List[Dict]:
+        self._append_session_history(entry)
+
+    def _append_session_history(self, entry: Dict):
+        """Queue one entry for this session's crash-recovery log
+
+        The log is a JSON Lines file under the user cache directory and holds the
+        full source and translated texts, so a session lost to a crash can be
+        reopened with File > Load History. Only the newest SESSION_HISTORY_FILES
+        logs are kept, each compacted to the last MAX_HISTORY entries once it
+        grows past SESSION_HISTORY_MAX_BYTES.
+        """
+        new_session = self._session_history_path is None
+        if new_session:
+            history_dir = os.path.join(
+                QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation), "history"
+            )
+            session_name = f"session-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl"
+            self._session_history_path = os.path.join(history_dir, session_name)
+        path = self._session_history_path
+        line = _dumps_line(entry)  # Serialize now; the worker must not read the entry dict
+        self._session_pool.start(lambda: self._write_session_history(path, line, new_session))
+
+    def _write_session_history(self, path: str, line: bytes, new_session: bool):
+        """Append a line to the session log (runs on the session pool thread)"""
+        try:
+            if new_session:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._prune_session_history(os.path.dirname(path))
+            with open(path, "ab") as f:
+                f.write(line)
+                size = f.tell()
+            if size > self.SESSION_HISTORY_MAX_BYTES:
+                with open(path, "rb") as f:
+                    lines = f.readlines()[-self.MAX_HISTORY :]
+                with open(path + ".tmp", "wb") as f:
+                    f.writelines(lines)
+                os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"Could not append to session history: {e}")
+
+    def _prune_session_history(self, history_dir: str):
+        """Delete old session logs so at most SESSION_HISTORY_FILES remain with the new one"""
+        # Names start with a timestamp, so sorting them orders the sessions
+        logs = sorted(name for name in os.listdir(history_dir) if name.startswith("session-") and name.endswith(".jsonl"))
+        for name in logs[: max(len(logs) - self.SESSION_HISTORY_FILES + 1, 0)]:
+            try:
+                os.remove(os.path.join(history_dir, name))
+            except OSError:
+                pass
+
+    def get_history(self) -> Deque[Dict]:
         """Get translation history"""
         return self.translation_history
 
     def clear_history(self):
-        """Clear history"""
+        """Clear history, including this session's log on disk"""
         self.translation_history.clear()
+        path, self._session_history_path = self._session_history_path, None
+        if path:
+            self._session_pool.start(lambda: self._remove_session_history(path))
 
-    def save_history(self, file_path: str) -> bool:
-        """Save history to file"""
+    def _remove_session_history(self, path: str):
+        """Delete a session log (runs on the session pool thread)"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def save_history(self, file_path: str, entries: Optional[List[Dict]] = None) -> bool:
+        """Save history to file, as JSON Lines for .jsonl paths and as a JSON array otherwise
+
+        Args:
+            file_path: Destination file
+            entries: Snapshot to write; defaults to the current history. Pass a
+                snapshot taken on the GUI thread when saving from a worker.
+        """
+        if entries is None:
+            entries = list(self.translation_history)
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(self.translation_history, f, indent=2, ensure_ascii=False)
+            with open(file_path, "wb") as f:
+                if file_path.lower().endswith(".jsonl"):
+                    f.writelines(_dumps_line(entry) for entry in entries)
+                else:
+                    f.write(_dumps(entries))
             return True
         except Exception:
             return False
 
-    def load_history(self, file_path: str) -> bool:
-        """Load history from file"""
+    def read_history(self, file_path: str) -> Optional[List[Dict]]:
+        """Parse a JSON Lines or JSON array history file without touching the current history
+
+        Returns:
+            The parsed entries, or None if the file could not be read
+        """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                self.translation_history = json.load(f)
-            return True
+            with open(file_path, "rb") as f:
+                return list(_parse_history(f.read()))
         except Exception:
+            return None
+
+    def set_history(self, entries: Iterable[Dict]):
+        """Replace the history, keeping the newest MAX_HISTORY entries"""
+        self.translation_history = deque(entries, maxlen=self.MAX_HISTORY)
+
+    def load_history(self, file_path: str) -> bool:
+        """Load history from a JSON Lines or JSON array file"""
+        entries = self.read_history(file_path)
+        if entries is None:
             return False
+        self.set_history(entries)
+        return True
 
     def update_settings(self, settings: Dict):
         """Update model settings"""
@@ -208,7 +370,24 @@ class TranslationManager:
         """Check if model is loaded"""
         return self.model.is_loaded if self.model else False
 
+    def get_last_error(self) -> Optional[str]:
+        """Return the last model loading error, if the current handler recorded one"""
+        return getattr(self.model, "last_error", None) or None
+
     def unload_model(self):
         """Unload the model"""
         if self.model:
             self.model.unload_model()
+
+    def shutdown(self):
+        """Stop the translation worker thread, dropping jobs that have not started yet"""
+        if self._worker is not None:
+            # Waiting behind every queued job would keep the window from closing
+            while True:
+                try:
+                    self._request_queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._request_queue.put(None)
+            self._worker.wait()
+            self._worker = None
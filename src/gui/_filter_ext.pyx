@@ -0,0 +1,22 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional C implementation of the FilterableComboBox substring scan.
+Build in place with: cythonize -i src/gui/_filter_ext.pyx
+"""
+
+from cpython.list cimport PyList_GET_ITEM, PyList_GET_SIZE
+from cpython.unicode cimport PyUnicode_Find, PyUnicode_GET_LENGTH
+
+
+def filter_contains(list items, str needle, int cap):
+    """Return indices of items containing needle, stopping after cap hits"""
+    cdef Py_ssize_t i, n = PyList_GET_SIZE(items)
+    cdef list hits = []
+    cdef object item
+    for i in range(n):
+        item = <object>PyList_GET_ITEM(items, i)
+        if PyUnicode_Find(item, needle, 0, PyUnicode_GET_LENGTH(item), 1) != -1:
+            hits.append(i)
+            if len(hits) >= cap:
+                break
+    return hits
@@ -2,8 +2,65 @@
 Custom Filterable ComboBox for PyQt6 with live filtering popup, no auto-completion
 """
 
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
 from PyQt6.QtWidgets import QComboBox, QCompleter
-from PyQt6.QtCore import Qt, QStringListModel
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QStringListModel, Qt, QTimer
+
+try:
+    from src.gui._filter_ext import filter_contains
+except ImportError:
+    filter_contains = None  # Rozszerzenie Cython nie jest zbudowane, zostaje skan w Pythonie
+
+
+@lru_cache(maxsize=64)
+def _substring_search(needle):
+    """Return the compiled search for a literal needle, shared by all combo boxes"""
+    return re.compile(re.escape(needle)).search
+
+
+class FilteredStringListModel(QAbstractListModel):
+    """List model showing a subset of a source list by index, without copying the strings"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source: list[str] = []
+        self._rows = array("i")  # Indeksy widocznych pozycji w _source
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._source[self._rows[index.row()]]
+        return None
+
+    def set_source(self, items):
+        """Replace the source list and clear the visible rows"""
+        self.beginResetModel()
+        self._source = items
+        self._rows = array("i")
+        self.endResetModel()
+
+    def set_visible(self, indices):
+        """Show the given source indices, changing rows in place instead of resetting the model"""
+        old_count = len(self._rows)
+        new_count = len(indices)
+        overlap = min(old_count, new_count)
+        if overlap:
+            self._rows[:overlap] = array("i", indices[:overlap])
+            self.dataChanged.emit(self.index(0), self.index(overlap - 1))
+        if new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            del self._rows[new_count:]
+            self.endRemoveRows()
+        elif new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self._rows.extend(indices[old_count:])
+            self.endInsertRows()
 
 
 class FilterableComboBox(QComboBox):
@@ -13,48 +70,254 @@ class FilterableComboBox(QComboBox):
     Select by clicking or pressing Enter on the desired item.
     """
 
+    FILTER_DELAY_MS = 80
+    MAX_RESULTS = 50
+
+    # Dane budowane w addItems, które można współdzielić między comboboxami (share_items)
+    _SHARED_ATTRS = (
+        "_items",
+        "_items_folded",
+        "_index_of",
+        "_joined_folded",
+        "_line_starts",
+        "_sorted_folded",
+        "_sorted_index",
+        "_trigrams",
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setEditable(True)
         self.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
 
-        # Model z wszystkimi opcjami
-        self.source_model = QStringListModel()
+        # Model z wszystkimi opcjami, wspólny dla QComboBox i filtrowania
+        self.source_model = QStringListModel(self)
+        self.setModel(self.source_model)
+        self._items: list[str] = []
+        self._items_folded: list[str] = []  # Wersje po casefold(), liczone raz w addItems
+        self._index_of: dict[str, int] = {}  # Tekst -> indeks pozycji, zamiast liniowego findText
+        self._joined_folded = ""  # Wszystkie pozycje w jednym buforze rozdzielone "\n"
+        self._line_starts: list[int] = []
+        self._sorted_folded: list[str] = []  # Posortowane wersje do wyszukiwania prefiksów
+        self._sorted_index = array("i")  # Indeksy oryginalnych pozycji dla _sorted_folded
+        self._trigrams: dict[str, array] = {}  # Trigram -> indeksy pozycji, które go zawierają
 
-        # Ustawienie QCompleter w trybie popup
-        self.completer_ = QCompleter(self.source_model, self)
-        self.completer_.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
-        self.completer_.setFilterMode(Qt.MatchFlag.MatchContains)
-        self.completer_.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        # Wynik poprzedniego filtrowania, używany gdy tekst jest dopisywany
+        self._last_needle = ""
+        self._last_hits: list[int] = []
+        self._last_complete = False
 
-        self.setCompleter(self.completer_)
+        # QCompleter i model popupu tworzone dopiero przy pierwszym użyciu (_ensure_completer)
+        self.completer_ = None
+        self._popup_model = None
+        self._shown: list[int] = []  # Indeksy aktualnie widoczne w _popup_model
+
+        # Opóźnienie filtrowania, żeby seria klawiszy dawała jedno przeliczenie
+        self._pending_text = ""
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.FILTER_DELAY_MS)
+        self._debounce.timeout.connect(self._run_filter)
 
         # Połączenie sygnałów
         self.lineEdit().textEdited.connect(self.on_text_edited)
+
+    def _ensure_completer(self):
+        """Create and install the completer on first focus or edit"""
+        if self.completer_ is not None:
+            return
+        # Osobny, mały model z wynikami dla popupu; source_model nie jest nadpisywany
+        self._popup_model = FilteredStringListModel(self)  # Wypełniany przez _run_filter
+        self._popup_model.set_source(self._items)
+        self._shown = []
+
+        # Ustawienie QCompleter w trybie popup; filtruje _run_filter, więc QCompleter tylko wyświetla wyniki
+        self.completer_ = QCompleter(self._popup_model, self)
+        self.completer_.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setCompleter(self.completer_)
         self.completer_.activated.connect(self.on_completer_activated)
 
+    def focusInEvent(self, event):
+        """Install the completer before the first edit"""
+        self._ensure_completer()
+        super().focusInEvent(event)
+
     def on_text_edited(self, text):
+        # Zapamiętuje tekst i odkłada filtrowanie do wygaśnięcia timera
+        self._ensure_completer()
+        if not text.strip():
+            # Pusty tekst: nie ma czego filtrować, wystarczy schować podpowiedzi
+            self._debounce.stop()
+            self._last_needle = ""
+            self.completer_.popup().hide()
+            self.hidePopup()
+            return
+        self._pending_text = text
+        self._debounce.start()
+
+    def _run_filter(self):
         # Filtruje listę podpowiedzi "na żywo"
-        filtered = [item for item in self.source_model.stringList() if text.lower() in item.lower()]
-        self.completer_.model().setStringList(filtered)
-        if text:
-            self.completer_.complete()
+        text = self._pending_text
+        if text != self.lineEdit().text():
+            return  # Tekst zmienił się w międzyczasie
+        needle = text.strip().casefold()
+        if self._last_needle and self._last_complete and needle.startswith(self._last_needle):
+            # Dopisany tekst: wystarczy przefiltrować poprzednie trafienia
+            hits, complete = self._filter_indices(needle, self._last_hits)
         else:
-            self.hidePopup()
+            hits, complete = self._scan_all(needle)
+        self._last_needle = needle
+        self._last_hits = hits
+        self._last_complete = complete
+        # Lokalne powiązania zamiast kolejnych odwołań do atrybutów
+        popup_model = self._popup_model
+        completer = self.completer_
+        if hits != self._shown:
+            # Model aktualizowany tylko gdy lista wyników faktycznie się zmieniła;
+            # odświeżanie popupu wstrzymane, żeby był jeden repaint zamiast kilku
+            popup = completer.popup()
+            popup.setUpdatesEnabled(False)
+            try:
+                popup_model.set_visible(hits)
+                self._shown = hits
+                completer.complete()
+            finally:
+                popup.setUpdatesEnabled(True)
+        else:
+            completer.complete()
+
+    def _filter_indices(self, needle, indices):
+        """Filter item indices by needle, stopping at MAX_RESULTS"""
+        items_folded = self._items_folded
+        matches = []
+        append = matches.append
+        limit = self.MAX_RESULTS
+        for i in indices:
+            if needle in items_folded[i]:
+                append(i)
+                if len(matches) >= limit:
+                    return matches, False  # Popup pokazuje najwyżej MAX_RESULTS pozycji
+        return matches, True
+
+    def _scan_all(self, needle):
+        """Collect prefix matches via binary search, then fill up with substring matches"""
+        sorted_folded = self._sorted_folded
+        limit = self.MAX_RESULTS
+        lo = bisect_left(sorted_folded, needle)
+        hi = bisect_left(sorted_folded, needle + "\uffff")
+        prefix_hits = sorted(self._sorted_index[lo:hi])  # Z powrotem w kolejności oryginalnej
+        if len(prefix_hits) >= limit:
+            # Same dopasowania prefiksowe wypełniają popup, pełne skanowanie niepotrzebne
+            return prefix_hits[:limit], False
+
+        matches = prefix_hits
+        append = matches.append
+        seen = set(prefix_hits)
+        if len(needle) >= 3:
+            hits = self._trigram_hits(needle)
+        elif filter_contains is not None:
+            # Pierwsze limit + len(seen) trafień wystarczy, bo prefiksowe też zawierają needle
+            hits = filter_contains(self._items_folded, needle, limit + len(seen))
+        else:
+            hits = self._iter_hits(needle)
+        for i in hits:
+            if i not in seen:
+                append(i)
+                if len(matches) >= limit:
+                    return matches, False
+        return matches, True
+
+    def _trigram_hits(self, needle):
+        """Yield indices of items containing needle, checking only items that share all its trigrams"""
+        postings = []
+        for gram in {needle[i : i + 3] for i in range(len(needle) - 2)}:
+            posting = self._trigrams.get(gram)
+            if posting is None:
+                return  # Żadna pozycja nie zawiera tego trigramu
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        items_folded = self._items_folded
+        for i in sorted(candidates):
+            if needle in items_folded[i]:
+                yield i
+
+    def _iter_hits(self, needle):
+        """Yield indices of items containing needle, scanning the joined buffer with one compiled pattern"""
+        search = _substring_search(needle)
+        buffer = self._joined_folded
+        starts = self._line_starts
+        pos = 0
+        while (hit := search(buffer, pos)) is not None:
+            i = bisect_right(starts, hit.start()) - 1
+            yield i
+            # Kolejne szukanie od początku następnej pozycji
+            if i + 1 >= len(starts):
+                return
+            pos = starts[i + 1]
 
     def on_completer_activated(self, text):
         # Ustawienie wybranej wartości
+        self._debounce.stop()
         self.setCurrentText(text)
         self.hidePopup()
+        # Zawężone wyniki nie dotyczą już nowego tekstu; następna edycja filtruje od zera
+        self._last_needle = ""
+        if self._shown:
+            self._popup_model.set_visible([])
+            self._shown = []
 
     def addItems(self, texts):
         """Add items to the source model"""
-        self.source_model.setStringList(texts)
-        self.completer_.model().setStringList(texts)  # Initial full list
+        self._items = list(texts)
+        self._items_folded = [t.casefold() for t in self._items]
+        self._index_of = {t: i for i, t in enumerate(self._items)}
+        self._joined_folded = "\n".join(self._items_folded)
+        self._line_starts = []
+        offset = 0
+        for folded in self._items_folded:
+            self._line_starts.append(offset)
+            offset += len(folded) + 1
+        order = sorted(range(len(self._items_folded)), key=self._items_folded.__getitem__)
+        self._sorted_folded = [self._items_folded[i] for i in order]
+        self._sorted_index = array("i", order)
+        self._trigrams = {}
+        for index, folded in enumerate(self._items_folded):
+            for gram in {folded[i : i + 3] for i in range(len(folded) - 2)}:
+                self._trigrams.setdefault(gram, array("i")).append(index)
+        if self.source_model.parent() is not self:
+            # Model współdzielony przez share_items; nowa lista dostaje własny model
+            self._set_source_model(QStringListModel(self))
+        self.source_model.setStringList(self._items)
+        self._reset_filter_state()
+
+    def share_items(self, other):
+        """Reuse another combo's items, search indices and source model instead of building copies"""
+        for name in self._SHARED_ATTRS:
+            setattr(self, name, getattr(other, name))
+        self._set_source_model(other.source_model)
+        self._reset_filter_state()
+
+    def _set_source_model(self, model):
+        """Switch the combo to model while the completer keeps showing the popup model"""
+        self.source_model = model
+        self.setModel(model)
+        if self.completer_ is not None:
+            # setModel() podmienia też model completera linii edycji
+            self.completer_.setModel(self._popup_model)
+
+    def _reset_filter_state(self):
+        """Forget previous filter results after the item list changed"""
+        self._last_needle = ""
+        self._last_hits = []
+        self._last_complete = False
+        if self._popup_model is not None:
+            self._popup_model.set_source(self._items)  # Stare wyniki nie pasują do nowej listy
+            self._shown = []
 
     def setCurrentText(self, text):
         """Set current text"""
-        index = self.findText(text)
+        index = self._index_of.get(text, -1) if self._index_of else self.findText(text)
         if index >= 0:
             self.setCurrentIndex(index)
         else:
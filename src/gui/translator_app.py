@@ -4,9 +4,10 @@ Main PyQt6 GUI application for Seed-X Translation
 
 import sys
 import os
-from datetime import datetime
+import time
+from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from PyQt6.QtWidgets import (
     QApplication,
@@ -14,7 +15,7 @@ from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
-    QTextEdit,
+    QPlainTextEdit,
     QPushButton,
     QLabel,
     QFileDialog,
@@ -32,25 +33,186 @@ from PyQt6.QtWidgets import (
     QListWidgetItem,
     QComboBox,
 )
-from PyQt6.QtCore import Qt, QSettings, QTimer
-from PyQt6.QtGui import QAction
+from PyQt6.QtCore import Qt, QEventLoop, QObject, QRunnable, QSettings, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QAction, QTextCursor
 
-from src.utils.config import LANGUAGES, UI_CONFIG, GENERATION_CONFIG, DEFAULT_MODEL_PATH
+from src.utils.config import LANG_NAMES, UI_CONFIG, GENERATION_CONFIG, DEFAULT_MODEL_PATH
 from src.gui.filterable_combobox import FilterableComboBox
-from src.backend.translation_backend import TranslationManager
+
+# Hidden folders and Hugging Face hub cache layout (models--org--name/blobs, snapshots, refs) hold no loose GGUFs
+_SKIPPED_DIR_PREFIXES = (".", "models--", "blobs", "snapshots", "refs")
+
+
+def _scan_gguf(path: str, subdirs: Optional[list] = None):
+    """Yield (size, path) for every non-BF16 GGUF file under path, without following symlinks
+
+    Directories or entries that cannot be read (permissions, broken mounts, files removed mid-scan) are skipped.
+
+    Args:
+        path: Directory to scan
+        subdirs: If given, subdirectories are appended here instead of being scanned
+    """
+    try:
+        # Read the listing up front so no directory handle stays open while recursing
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    for entry in entries:
+        try:
+            if entry.is_symlink():
+                continue
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir:
+            if entry.name.startswith(_SKIPPED_DIR_PREFIXES):
+                continue
+            if subdirs is None:
+                yield from _scan_gguf(entry.path)
+            else:
+                subdirs.append(entry.path)
+            continue
+        name_lower = entry.name.lower()
+        if not name_lower.endswith(".gguf") or "bf16" in name_lower:
+            continue  # Filter on the name before paying for a stat
+        try:
+            size = entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue  # Removed since the listing was read
+        yield size, entry.path
+
+
+class CachedQSettings:
+    """QSettings front end that keeps values in memory and skips writes that change nothing"""
+
+    _MISSING = object()
+
+    def __init__(self, organization: str, application: str):
+        self._settings = QSettings(organization, application)
+        self._cache: Dict[str, Any] = {}
+
+    def value(self, key: str, default: Any = None) -> Any:
+        """Return a setting, reading the backend only on first access"""
+        cached = self._cache.get(key, self._MISSING)
+        if cached is self._MISSING:
+            cached = self._settings.value(key) if self._settings.contains(key) else None
+            self._cache[key] = cached
+        return default if cached is None else cached
+
+    def setValue(self, key: str, value: Any):
+        """Store a setting, skipping the backend when the value is unchanged"""
+        if key in self._cache and self._cache[key] == value:
+            return
+        self._cache[key] = value
+        self._settings.setValue(key, value)
+
+    def sync(self):
+        """Flush pending writes to the backend"""
+        self._settings.sync()
+
+
+class HistoryIOSignals(QObject):
+    """Signals for HistoryIOWorker (QRunnable cannot emit signals itself)"""
+
+    finished = pyqtSignal(object)
+
+
+class HistoryIOWorker(QRunnable):
+    """Run a history save or load call on the global thread pool and emit its result"""
+
+    def __init__(self, func, file_path: str):
+        super().__init__()
+        self.func = func
+        self.file_path = file_path
+        self.signals = HistoryIOSignals()
+
+    def run(self):
+        try:
+            result = self.func(self.file_path)
+        except Exception as e:
+            print(f"History I/O failed: {e}")
+            result = None
+        self.signals.finished.emit(result)
 
 
 class TranslatorMainWindow(QMainWindow):
     """Main application window"""
 
+    PARTIAL_FLUSH_MS = 40
+    STATUS_FLUSH_MS = 50
+
+    # Positions of the entries in backend_combo, see create_model_controls
+    BACKEND_GGUF_IDX = 0
+    BACKEND_HF_IDX = 1
+
+    # Style of the main Translate button, kept as one shared string
+    TRANSLATE_BUTTON_QSS = """
+        QPushButton#translateButton {
+            background-color: #0084ff;
+            color: white;
+            font-size: 14px;
+            font-weight: bold;
+            border-radius: 5px;
+            padding: 10px 30px;
+        }
+        QPushButton#translateButton:hover {
+            background-color: #0066cc;
+        }
+        QPushButton#translateButton:disabled {
+            background-color: #cccccc;
+        }
+    """
+
     def __init__(self):
         super().__init__()
-        self.manager = TranslationManager()
-        self.settings = QSettings("SeedX", "Translator")
+        self.manager = None  # Created by _bootstrap_backend once the window is shown
+        self._file_dialog: Optional[QFileDialog] = None  # Created on first use, then reused
+        self._download_dialog = None  # Built by _ensure_download_dialog
+        self._download_progress = None
+        self._ts_cache: tuple[int, str] = (0, "")  # (epoch second, formatted HH:MM:SS)
+        self._model_path_cache: Optional[tuple[str, Optional[str]]] = None  # (models/ mtime, autodetected path)
+
+        # Streamed partial translations are written at most once per PARTIAL_FLUSH_MS
+        self._pending_partial: Optional[str] = None
+        self._shown_partial = ""
+        self._partial_timer = QTimer(self)
+        self._partial_timer.setSingleShot(True)
+        self._partial_timer.setInterval(self.PARTIAL_FLUSH_MS)
+        self._partial_timer.timeout.connect(self._flush_partial)
+
+        # Backend progress messages reach the status bar at most once per STATUS_FLUSH_MS
+        self._pending_status: Optional[str] = None
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(self.STATUS_FLUSH_MS)
+        self._status_timer.timeout.connect(self._flush_status)
+        self.settings = CachedQSettings("SeedX", "Translator")
         self.init_ui()
         self.load_settings()
+        QTimer.singleShot(0, self._bootstrap_backend)
+
+    def _bootstrap_backend(self):
+        """Import the translation backend and create the manager after the window has painted"""
+        self.status_bar.showMessage("Loading translation backend...")
+        # The import below blocks the event loop; paint the message first, without handling input
+        QApplication.processEvents(QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents)
+        from src.backend.translation_backend import TranslationManager
+
+        self.manager = TranslationManager()
+        self.manager.switch_backend(self.backend_combo.currentText())
+        self.status_bar.showMessage("Ready")
+        self.update_history_list()
         self.try_autoload_model()
 
+    def _backend_ready(self) -> bool:
+        """Return True once the backend is bootstrapped, otherwise ask the user to wait"""
+        if self.manager is None:
+            self.status_bar.showMessage("Translation backend is still loading, please wait...", 2000)
+            return False
+        return True
+
     def init_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle("Seed-X Translation - PyQt6")
@@ -60,37 +222,42 @@ class TranslatorMainWindow(QMainWindow):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
 
-        # Create menu bar
-        self.create_menu_bar()
+        # Hold off repaints until the whole window is assembled
+        self.setUpdatesEnabled(False)
+        try:
+            # Create menu bar
+            self.create_menu_bar()
 
-        # Create toolbar
-        self.create_toolbar()
+            # Create toolbar
+            self.create_toolbar()
 
-        # Create status bar
-        self.status_bar = QStatusBar()
-        self.setStatusBar(self.status_bar)
-        self.status_bar.showMessage("Ready")
+            # Create status bar
+            self.status_bar = QStatusBar()
+            self.setStatusBar(self.status_bar)
+            self.status_bar.showMessage("Ready")
 
-        # Main layout
-        main_layout = QVBoxLayout(central_widget)
+            # Main layout
+            main_layout = QVBoxLayout(central_widget)
 
-        # Model controls
-        model_group = self.create_model_controls()
-        main_layout.addWidget(model_group)
+            # Model controls
+            model_group = self.create_model_controls()
+            main_layout.addWidget(model_group)
 
-        # Language selection
-        lang_group = self.create_language_controls()
-        main_layout.addWidget(lang_group)
+            # Language selection
+            lang_group = self.create_language_controls()
+            main_layout.addWidget(lang_group)
 
-        # Translation area
-        translation_widget = self.create_translation_area()
-        main_layout.addWidget(translation_widget, stretch=1)
+            # Translation area
+            translation_widget = self.create_translation_area()
+            main_layout.addWidget(translation_widget, stretch=1)
 
-        # Settings dock
-        self.create_settings_dock()
+            # Settings dock
+            self.create_settings_dock()
 
-        # History dock
-        self.create_history_dock()
+            # History dock
+            self.create_history_dock()
+        finally:
+            self.setUpdatesEnabled(True)
 
     def create_menu_bar(self):
         """Create the application menu bar"""
@@ -106,14 +273,14 @@ class TranslatorMainWindow(QMainWindow):
 
         file_menu.addSeparator()
 
-        save_history_action = QAction("Save History", self)
-        save_history_action.setShortcut("Ctrl+S")
-        save_history_action.triggered.connect(self.save_history)
-        file_menu.addAction(save_history_action)
+        self.save_history_action = QAction("Save History", self)
+        self.save_history_action.setShortcut("Ctrl+S")
+        self.save_history_action.triggered.connect(self.save_history)
+        file_menu.addAction(self.save_history_action)
 
-        load_history_action = QAction("Load History", self)
-        load_history_action.triggered.connect(self.load_history)
-        file_menu.addAction(load_history_action)
+        self.load_history_action = QAction("Load History", self)
+        self.load_history_action.triggered.connect(self.load_history)
+        file_menu.addAction(self.load_history_action)
 
         file_menu.addSeparator()
 
@@ -174,9 +341,10 @@ class TranslatorMainWindow(QMainWindow):
         toolbar.addSeparator()
 
         # Translate button
-        translate_action = QAction("Translate", self)
-        translate_action.triggered.connect(self.translate)
-        toolbar.addAction(translate_action)
+        self.translate_action = QAction("Translate", self)
+        self.translate_action.triggered.connect(self.translate)
+        self.translate_action.setEnabled(False)  # Enabled together with translate_button
+        toolbar.addAction(self.translate_action)
 
         # Clear button
         clear_action = QAction("Clear All", self)
@@ -198,13 +366,24 @@ class TranslatorMainWindow(QMainWindow):
         # Backend selection
         backend_label = QLabel("Backend:")
         self.backend_combo = QComboBox()
-        backends = ["GGUF (llama.cpp)", "Original (Transformers)"]
+        backends = ["GGUF (llama.cpp)", "Original (Transformers)"]  # Order matches BACKEND_*_IDX
         self.backend_combo.addItems(backends)
-        self.backend_combo.setCurrentIndex(0)
+        self.backend_combo.setCurrentIndex(self.BACKEND_GGUF_IDX)
         self.backend_combo.currentIndexChanged.connect(self.on_backend_changed)
         layout.addWidget(backend_label)
         layout.addWidget(self.backend_combo)
 
+        # Weight quantization (Transformers backend only)
+        self.quantization_label = QLabel("Quantization:")
+        self.quantization_combo = QComboBox()
+        self.quantization_combo.addItem("4-bit (NF4)", "nf4")
+        self.quantization_combo.addItem("8-bit", "int8")
+        self.quantization_combo.addItem("None (FP16)", "none")
+        self.quantization_combo.setToolTip("Quantize the original model with bitsandbytes when loading on a CUDA GPU")
+        self.quantization_combo.setEnabled(False)
+        layout.addWidget(self.quantization_label)
+        layout.addWidget(self.quantization_combo)
+
         self.model_path_label = QLabel("No model loaded")
         self.model_path_label.setStyleSheet("QLabel { color: #666; }")
         layout.addWidget(self.model_path_label, stretch=1)
@@ -238,7 +417,7 @@ class TranslatorMainWindow(QMainWindow):
         # Source language
         layout.addWidget(QLabel("From:"))
         self.source_lang = FilterableComboBox()
-        self.source_lang.addItems(list(LANGUAGES.keys()))
+        self.source_lang.addItems(LANG_NAMES)
         self.source_lang.setCurrentText("English")
         layout.addWidget(self.source_lang, stretch=1)
 
@@ -251,7 +430,7 @@ class TranslatorMainWindow(QMainWindow):
         # Target language
         layout.addWidget(QLabel("To:"))
         self.target_lang = FilterableComboBox()
-        self.target_lang.addItems(list(LANGUAGES.keys()))
+        self.target_lang.share_items(self.source_lang)
         self.target_lang.setCurrentText("Polish")
         layout.addWidget(self.target_lang, stretch=1)
 
@@ -275,7 +454,7 @@ class TranslatorMainWindow(QMainWindow):
         input_widget = QWidget()
         input_layout = QVBoxLayout(input_widget)
         input_layout.addWidget(QLabel("Input Text:"))
-        self.input_text = QTextEdit()
+        self.input_text = QPlainTextEdit()
         self.input_text.setPlaceholderText("Enter text to translate...")
         input_layout.addWidget(self.input_text)
         splitter.addWidget(input_widget)
@@ -284,8 +463,9 @@ class TranslatorMainWindow(QMainWindow):
         output_widget = QWidget()
         output_layout = QVBoxLayout(output_widget)
         output_layout.addWidget(QLabel("Translation:"))
-        self.output_text = QTextEdit()
+        self.output_text = QPlainTextEdit()
         self.output_text.setReadOnly(True)
+        self.output_text.setUndoRedoEnabled(False)  # Read-only, so an undo stack is never used
         self.output_text.setPlaceholderText("Translation will appear here...")
         output_layout.addWidget(self.output_text)
         splitter.addWidget(output_widget)
@@ -300,22 +480,8 @@ class TranslatorMainWindow(QMainWindow):
 
         self.translate_button = QPushButton("Translate")
         self.translate_button.setMinimumHeight(40)
-        self.translate_button.setStyleSheet("""
-            QPushButton {
-                background-color: #0084ff;
-                color: white;
-                font-size: 14px;
-                font-weight: bold;
-                border-radius: 5px;
-                padding: 10px 30px;
-            }
-            QPushButton:hover {
-                background-color: #0066cc;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-            }
-        """)
+        self.translate_button.setObjectName("translateButton")
+        self.translate_button.setStyleSheet(self.TRANSLATE_BUTTON_QSS)
         self.translate_button.clicked.connect(self.translate)
         self.translate_button.setEnabled(False)
         button_layout.addWidget(self.translate_button)
@@ -331,9 +497,18 @@ class TranslatorMainWindow(QMainWindow):
         return widget
 
     def create_settings_dock(self):
-        """Create the settings dock widget"""
+        """Create the settings dock widget; its contents are built the first time it is shown"""
         self.settings_dock = QDockWidget("Generation Settings", self)
         self.settings_dock.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea)
+        self._settings_built = False
+        self.settings_dock.visibilityChanged.connect(self._ensure_settings_built)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.settings_dock)
+
+    def _ensure_settings_built(self, visible: bool = True):
+        """Build the settings dock contents on first show"""
+        if not visible or self._settings_built:
+            return
+        self._settings_built = True
 
         settings_widget = QWidget()
         settings_layout = QVBoxLayout(settings_widget)
@@ -389,12 +564,20 @@ class TranslatorMainWindow(QMainWindow):
         settings_layout.addStretch()
 
         self.settings_dock.setWidget(settings_widget)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.settings_dock)
 
     def create_history_dock(self):
-        """Create the history dock widget"""
+        """Create the history dock widget; its contents are built the first time it is shown"""
         self.history_dock = QDockWidget("Translation History", self)
         self.history_dock.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea)
+        self._history_built = False
+        self.history_dock.visibilityChanged.connect(self._ensure_history_built)
+        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.history_dock)
+
+    def _ensure_history_built(self, visible: bool = True):
+        """Build the history dock contents on first show"""
+        if not visible or self._history_built:
+            return
+        self._history_built = True
 
         history_widget = QWidget()
         history_layout = QVBoxLayout(history_widget)
@@ -417,30 +600,34 @@ class TranslatorMainWindow(QMainWindow):
         history_layout.addLayout(history_controls)
 
         self.history_dock.setWidget(history_widget)
-        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.history_dock)
+        self.update_history_list()
 
     def on_backend_changed(self):
         """Switch backend"""
         backend_text = self.backend_combo.currentText()
-        self.manager.switch_backend(backend_text)
+        if self.manager is not None:
+            self.manager.switch_backend(backend_text)  # Otherwise _bootstrap_backend picks up the selection
+        self.quantization_combo.setEnabled("Transformers" in backend_text)
 
         # Reset UI state
         self.model_path_label.setText("No model loaded")
-        self.translate_button.setEnabled(False)
+        self._set_translate_enabled(False)
         self.load_button.setEnabled(False)
 
     def browse_model(self):
         """Browse for a model path depending on backend"""
+        self._model_path_cache = None  # The user may be about to add or pick a different model
         backend_text = self.backend_combo.currentText()
 
         if "GGUF" in backend_text:
             # llama.cpp backend: select GGUF file
-            file_path, _ = QFileDialog.getOpenFileName(
-                self, "Select GGUF Model", DEFAULT_MODEL_PATH, "GGUF Models (*.gguf);;All Files (*.*)"
+            file_path = self._choose_path(
+                "Select GGUF Model", "lastModelDir", DEFAULT_MODEL_PATH, "GGUF Models (*.gguf);;All Files (*.*)"
             )
             if file_path:
                 # Block BF16 GGUF on llama.cpp backend (known to crash on Windows)
-                if "bf16" in os.path.basename(file_path).lower():
+                name_lower = file_path.rsplit("/", 1)[-1].lower()  # Qt paths always use "/"
+                if "bf16" in name_lower:
                     QMessageBox.critical(
                         self,
                         "Unsupported GGUF format",
@@ -454,25 +641,68 @@ class TranslatorMainWindow(QMainWindow):
                 self.load_button.setEnabled(True)
         else:
             # Transformers backend: select model directory (HuggingFace format)
-            dir_path = QFileDialog.getExistingDirectory(self, "Select HF Model Directory", DEFAULT_MODEL_PATH)
+            dir_path = self._choose_path(
+                "Select HF Model Directory", "lastModelDir", DEFAULT_MODEL_PATH, file_mode=QFileDialog.FileMode.Directory
+            )
             if dir_path:
                 self.model_path_label.setText(dir_path)
                 self.load_button.setEnabled(True)
 
+    def _choose_path(
+        self,
+        title: str,
+        dir_key: str,
+        default_dir: str,
+        name_filter: str = "",
+        file_mode: QFileDialog.FileMode = QFileDialog.FileMode.ExistingFile,
+        accept_mode: QFileDialog.AcceptMode = QFileDialog.AcceptMode.AcceptOpen,
+        default_name: str = "",
+    ) -> str:
+        """Show the shared file dialog, starting in the directory remembered under dir_key
+
+        Returns:
+            The selected path, or an empty string if the dialog was cancelled
+        """
+        if self._file_dialog is None:
+            self._file_dialog = QFileDialog(self)
+        dialog = self._file_dialog
+        dialog.setWindowTitle(title)
+        dialog.setFileMode(file_mode)
+        dialog.setAcceptMode(accept_mode)
+        dialog.setOption(QFileDialog.Option.ShowDirsOnly, file_mode == QFileDialog.FileMode.Directory)
+        dialog.setNameFilter(name_filter)
+        dialog.setDirectory(self.settings.value(dir_key, "") or default_dir or os.getcwd())
+        dialog.selectFile(default_name)
+
+        if not dialog.exec():
+            return ""
+        selected = dialog.selectedFiles()
+        if not selected:
+            return ""
+        path = selected[0]
+        self.settings.setValue(dir_key, os.path.dirname(path))
+        return path
+
     def load_model(self):
         """Load the selected model using manager"""
         model_path = self.model_path_label.text()
         if model_path == "No model loaded":
             QMessageBox.warning(self, "Warning", "Please select a model file first.")
             return
+        if not self._backend_ready():
+            return
 
         # Disable controls during loading
         self.load_button.setEnabled(False)
         self.browse_button.setEnabled(False)
-        self.translate_button.setEnabled(False)
+        self._set_translate_enabled(False)
         self.model_progress.show()
 
-        self.load_thread = self.manager.load_model(model_path, self.update_status, self.on_model_loaded)
+        load_kwargs = {}
+        if "Transformers" in self.backend_combo.currentText():
+            load_kwargs["quantization"] = self.quantization_combo.currentData()
+
+        self.load_thread = self.manager.load_model(model_path, self.update_status, self.on_model_loaded, **load_kwargs)
 
     def on_model_loaded(self, success: bool):
         """Handle model loading completion"""
@@ -481,8 +711,8 @@ class TranslatorMainWindow(QMainWindow):
         self.load_button.setEnabled(True)
 
         if success:
-            self.translate_button.setEnabled(True)
-            self.status_bar.showMessage("Model loaded successfully!")
+            self._set_translate_enabled(True)
+            self._set_status("Model loaded successfully!")
             self.model_path_label.setStyleSheet("QLabel { color: green; }")
 
             # Show model info
@@ -500,15 +730,23 @@ class TranslatorMainWindow(QMainWindow):
                 details.append(f"Threads: {info.get('threads')}")
             QMessageBox.information(self, "Model Loaded", "\n".join(details))
         else:
-            self.status_bar.showMessage("Failed to load model")
+            self._set_status("Failed to load model")
             self.model_path_label.setStyleSheet("QLabel { color: red; }")
             err = "Failed to load the model. Please check the file and try again."
-            if hasattr(self.manager.model, "last_error") and getattr(self.manager.model, "last_error"):
-                err += f"\n\nDetails:\n{self.manager.model.last_error}"
+            err_detail = self.manager.get_last_error()
+            if err_detail:
+                err += f"\n\nDetails:\n{err_detail}"
             QMessageBox.critical(self, "Error", err)
 
+    def _set_translate_enabled(self, enabled: bool):
+        """Enable or disable every way of starting a translation"""
+        self.translate_button.setEnabled(enabled)
+        self.translate_action.setEnabled(enabled)
+
     def translate(self):
         """Perform translation using manager"""
+        if not self._backend_ready():
+            return
         if not self.manager.is_model_loaded():
             QMessageBox.warning(self, "Warning", "Please load a model first.")
             return
@@ -519,20 +757,15 @@ class TranslatorMainWindow(QMainWindow):
             return
 
         # Get settings
-        settings = {
-            "temperature": self.temperature_spin.value(),
-            "max_tokens": self.max_tokens_spin.value(),
-            "top_p": self.top_p_spin.value(),
-            "top_k": self.top_k_spin.value(),
-            "repeat_penalty": self.repeat_penalty_spin.value(),
-        }
+        settings = self.get_generation_settings()
 
-        # Disable translate button during translation
-        self.translate_button.setEnabled(False)
+        # Disable the translate button and action during translation
+        self._set_translate_enabled(False)
+        self._reset_partial()
         self.output_text.clear()
         self.output_text.setPlainText("Translating...")
 
-        self.translation_thread = self.manager.translate(
+        self.translation_job = self.manager.translate(
             text,
             self.source_lang.text(),
             self.target_lang.text(),
@@ -541,42 +774,105 @@ class TranslatorMainWindow(QMainWindow):
             self.on_translation_complete,
             self.on_translation_error,
             self.update_status,
+            self.on_translation_partial,
         )
 
+    def on_translation_partial(self, partial: str):
+        """Show the translation as it is being generated, coalescing updates on a short timer"""
+        if partial:
+            self._pending_partial = partial
+            if not self._partial_timer.isActive():
+                self._partial_timer.start()
+
+    def _flush_partial(self):
+        """Write the latest partial translation, appending only the new tail when possible"""
+        partial = self._pending_partial
+        self._pending_partial = None
+        if partial is None:
+            return
+        shown = self._shown_partial
+        if shown and partial.startswith(shown):
+            cursor = self.output_text.textCursor()
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(partial[len(shown) :])
+        else:
+            self.output_text.setPlainText(partial)
+        self._shown_partial = partial
+
+    def _reset_partial(self):
+        """Drop any streamed text that has not been written yet"""
+        self._partial_timer.stop()
+        self._pending_partial = None
+        self._shown_partial = ""
+
     def on_translation_complete(self, translation: str):
         """Handle translation completion"""
+        self._reset_partial()
         self.output_text.setPlainText(translation)
-        self.translate_button.setEnabled(True)
-        self.status_bar.showMessage("Translation complete!")
+        self._set_translate_enabled(True)
+        self._set_status("Translation complete!")
 
         # Add to history
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = self._timestamp()
+        full_input = self.input_text.toPlainText()
         history_entry = {
             "timestamp": timestamp,
             "source_lang": self.source_lang.text(),
             "target_lang": self.target_lang.text(),
-            "input": self.input_text.toPlainText()[:50] + "...",
-            "output": translation[:50] + "...",
-            "full_input": self.input_text.toPlainText(),
+            "input": self._preview(full_input),
+            "output": self._preview(translation),
+            "full_input": full_input,
             "full_output": translation,
         }
         self.manager.add_to_history(history_entry)
-        self.update_history_list()
+        self._append_history_item(history_entry)
+
+    def _timestamp(self) -> str:
+        """Return the current local time as HH:MM:SS, formatted at most once per second"""
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+        return self._ts_cache[1]
 
     def on_translation_error(self, error: str):
         """Handle translation error"""
+        self._reset_partial()
         self.output_text.setPlainText(f"Error: {error}")
-        self.translate_button.setEnabled(True)
-        self.status_bar.showMessage("Translation failed")
+        self._set_translate_enabled(True)
+        self._set_status("Translation failed")
         QMessageBox.critical(self, "Translation Error", f"An error occurred: {error}")
 
     def update_history_list(self):
         """Update the history list widget from manager's history"""
-        self.history_list.clear()
-        for entry in self.manager.get_history():
-            item_text = f"[{entry['timestamp']}] {entry['source_lang']} → {entry['target_lang']}: {entry['input']}"
-            item = QListWidgetItem(item_text)
-            self.history_list.addItem(item)
+        if not self._history_built or self.manager is None:
+            return  # Filled from the manager's history once both the dock and the backend exist
+        self.history_list.setUpdatesEnabled(False)
+        self.history_list.blockSignals(True)
+        try:
+            self.history_list.clear()
+            self.history_list.addItems([self._history_item_text(entry) for entry in self.manager.get_history()])
+        finally:
+            self.history_list.blockSignals(False)
+            self.history_list.setUpdatesEnabled(True)
+
+    def _append_history_item(self, entry: dict):
+        """Append one history entry to the list widget instead of rebuilding it"""
+        if not self._history_built:
+            return
+        self.history_list.addItem(self._history_item_text(entry))
+        # The manager keeps a bounded history; drop rows that fell off its front
+        while self.history_list.count() > len(self.manager.get_history()):
+            self.history_list.takeItem(0)
+
+    @staticmethod
+    def _preview(text: str, limit: int = 50) -> str:
+        """Shorten text for the history list, adding an ellipsis only when something was cut"""
+        return text[:limit] + "..." if len(text) > limit else text
+
+    @staticmethod
+    def _history_item_text(entry: dict) -> str:
+        """Format a history entry for the list widget"""
+        return f"[{entry['timestamp']}] {entry['source_lang']} → {entry['target_lang']}: {entry['input']}"
 
     def load_from_history(self, item: QListWidgetItem):
         """Load a translation from history"""
@@ -593,31 +889,71 @@ class TranslatorMainWindow(QMainWindow):
 
     def clear_history(self):
         """Clear translation history"""
+        if not self._backend_ready():
+            return
         self.manager.clear_history()
-        self.history_list.clear()
+        self.update_history_list()
 
     def save_history(self):
         """Save translation history to file"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Save History", "translation_history.json", "JSON Files (*.json);;All Files (*.*)"
+        if not self._backend_ready():
+            return
+        file_path = self._choose_path(
+            "Save History",
+            "lastHistoryDir",
+            "",
+            "JSON Files (*.json);;JSON Lines (*.jsonl);;All Files (*.*)",
+            accept_mode=QFileDialog.AcceptMode.AcceptSave,
+            default_name="translation_history.json",
         )
 
         if file_path:
-            if self.manager.save_history(file_path):
-                QMessageBox.information(self, "Success", "History saved successfully!")
-            else:
-                QMessageBox.critical(self, "Error", "Failed to save history")
+            # Snapshot on the GUI thread; the worker must not iterate the live deque
+            entries = list(self.manager.get_history())
+            self._run_history_io(lambda path: self.manager.save_history(path, entries), file_path, self.on_history_saved)
+
+    def on_history_saved(self, success: bool):
+        """Handle history save completion"""
+        if success:
+            QMessageBox.information(self, "Success", "History saved successfully!")
+        else:
+            QMessageBox.critical(self, "Error", "Failed to save history")
 
     def load_history(self):
         """Load translation history from file"""
-        file_path, _ = QFileDialog.getOpenFileName(self, "Load History", "", "JSON Files (*.json);;All Files (*.*)")
+        if not self._backend_ready():
+            return
+        file_path = self._choose_path(
+            "Load History", "lastHistoryDir", "", "JSON Files (*.json);;JSON Lines (*.jsonl);;All Files (*.*)"
+        )
 
         if file_path:
-            if self.manager.load_history(file_path):
-                self.update_history_list()
-                QMessageBox.information(self, "Success", "History loaded successfully!")
-            else:
-                QMessageBox.critical(self, "Error", "Failed to load history")
+            self._run_history_io(self.manager.read_history, file_path, self.on_history_loaded)
+
+    def on_history_loaded(self, entries: Optional[List[Dict]]):
+        """Swap in the entries parsed by the worker (runs on the GUI thread)"""
+        if entries is not None:
+            self.manager.set_history(entries)
+            self.update_history_list()
+            QMessageBox.information(self, "Success", "History loaded successfully!")
+        else:
+            QMessageBox.critical(self, "Error", "Failed to load history")
+
+    def _run_history_io(self, func, file_path: str, finished_callback):
+        """Run a history save/load on the thread pool while the history actions are disabled"""
+        self.save_history_action.setEnabled(False)
+        self.load_history_action.setEnabled(False)
+        self.status_bar.showMessage("Working on history file...")
+
+        def on_finished(result):
+            self.save_history_action.setEnabled(True)
+            self.load_history_action.setEnabled(True)
+            self.status_bar.showMessage("Ready")
+            finished_callback(result)
+
+        self.history_worker = HistoryIOWorker(func, file_path)
+        self.history_worker.signals.finished.connect(on_finished)
+        QThreadPool.globalInstance().start(self.history_worker)
 
     def swap_languages(self):
         """Swap source and target languages"""
@@ -627,11 +963,14 @@ class TranslatorMainWindow(QMainWindow):
         self.target_lang.setText(source_text)
 
         # Also swap the text if there's a translation
-        if self.output_text.toPlainText():
-            input_text = self.input_text.toPlainText()
-            output_text = self.output_text.toPlainText()
-            self.input_text.setPlainText(output_text)
-            self.output_text.setPlainText(input_text)
+        output_text = self.output_text.toPlainText()
+        if not output_text:
+            return
+        input_text = self.input_text.toPlainText()
+        if input_text == output_text:
+            return  # Swapping identical texts would only re-layout both documents
+        self.input_text.setPlainText(output_text)
+        self.output_text.setPlainText(input_text)
 
     def clear_all(self):
         """Clear input and output text"""
@@ -644,20 +983,28 @@ class TranslatorMainWindow(QMainWindow):
         clipboard.setText(self.output_text.toPlainText())
         self.status_bar.showMessage("Translation copied to clipboard", 2000)
 
-    def apply_settings(self):
-        """Apply generation settings"""
-        settings = {
+    def get_generation_settings(self) -> dict:
+        """Collect generation settings from the settings panel, or the defaults while it is not built"""
+        if not self._settings_built:
+            return {key: GENERATION_CONFIG[key] for key in ("temperature", "max_tokens", "top_p", "top_k", "repeat_penalty")}
+        return {
             "temperature": self.temperature_spin.value(),
             "max_tokens": self.max_tokens_spin.value(),
             "top_p": self.top_p_spin.value(),
             "top_k": self.top_k_spin.value(),
             "repeat_penalty": self.repeat_penalty_spin.value(),
         }
-        self.manager.update_settings(settings)
+
+    def apply_settings(self):
+        """Apply generation settings"""
+        if not self._backend_ready():
+            return
+        self.manager.update_settings(self.get_generation_settings())
         self.status_bar.showMessage("Settings applied", 2000)
 
     def reset_settings(self):
         """Reset settings to defaults"""
+        self._ensure_settings_built()
         self.temperature_spin.setValue(GENERATION_CONFIG["temperature"])
         self.max_tokens_spin.setValue(GENERATION_CONFIG["max_tokens"])
         self.top_p_spin.setValue(GENERATION_CONFIG["top_p"])
@@ -675,10 +1022,33 @@ class TranslatorMainWindow(QMainWindow):
 
     def update_status(self, message: str):
         """Update status bar message"""
+        self._pending_status = message
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+
+    def _flush_status(self):
+        """Show the latest message queued by update_status"""
+        if self._pending_status is not None:
+            self.status_bar.showMessage(self._pending_status)
+            self._pending_status = None
+
+    def _set_status(self, message: str):
+        """Show a final status message, dropping any queued progress message"""
+        self._status_timer.stop()
+        self._pending_status = None
         self.status_bar.showMessage(message)
 
     def download_model(self):
         """Download model automatically"""
+        self._ensure_download_dialog()
+        self._default_model_radio.setChecked(True)
+        self._download_dialog.exec()
+
+    def _ensure_download_dialog(self):
+        """Build the download dialog once and keep it around for later calls"""
+        if self._download_dialog is not None:
+            return
+
         from PyQt6.QtWidgets import QDialog, QRadioButton, QButtonGroup
 
         dialog = QDialog(self)
@@ -691,7 +1061,7 @@ class TranslatorMainWindow(QMainWindow):
         layout.addWidget(QLabel("Choose model to download:"))
 
         # Radio buttons for model selection
-        self.model_group = QButtonGroup()
+        self.model_group = QButtonGroup(dialog)
 
         # GGUF models
         layout.addWidget(QLabel("\nGGUF Models (for llama.cpp backend):"))
@@ -719,9 +1089,9 @@ class TranslatorMainWindow(QMainWindow):
         # Buttons
         button_layout = QHBoxLayout()
 
-        download_btn = QPushButton("Download")
-        download_btn.clicked.connect(lambda: self.start_download(dialog))
-        button_layout.addWidget(download_btn)
+        self._download_btn = QPushButton("Download")
+        self._download_btn.clicked.connect(self.start_download)
+        button_layout.addWidget(self._download_btn)
 
         cancel_btn = QPushButton("Cancel")
         cancel_btn.clicked.connect(dialog.reject)
@@ -729,11 +1099,29 @@ class TranslatorMainWindow(QMainWindow):
 
         layout.addLayout(button_layout)
 
-        dialog.exec()
+        self._default_model_radio = q4_radio
+        self._download_dialog = dialog
+
+    def _show_download_progress(self, label):
+        """Show the shared progress dialog, creating it on first use"""
+        progress = self._download_progress
+        if progress is None:
+            from PyQt6.QtWidgets import QProgressDialog
+
+            progress = QProgressDialog(label, "Cancel", 0, 0, self)
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            self._download_progress = progress
+        else:
+            progress.reset()
+            progress.setLabelText(label)
+        progress.show()
+        return progress
 
-    def start_download(self, dialog):
+    def start_download(self):
         """Start the model download"""
-        dialog.accept()
+        self._download_dialog.accept()
+        if not self._backend_ready():
+            return
 
         selected_id = self.model_group.checkedId()
 
@@ -748,11 +1136,7 @@ class TranslatorMainWindow(QMainWindow):
             model_name, repo_id, filename = models[selected_id]
 
             # Show progress dialog
-            from PyQt6.QtWidgets import QProgressDialog
-
-            progress = QProgressDialog(f"Downloading {model_name}...", "Cancel", 0, 0, self)
-            progress.setWindowModality(Qt.WindowModality.WindowModal)
-            progress.show()
+            progress = self._show_download_progress(f"Downloading {model_name}...")
 
             # Use manager's download_model method
             self.download_thread = self.manager.download_model(
@@ -772,14 +1156,8 @@ class TranslatorMainWindow(QMainWindow):
             self.load_button.setEnabled(True)
 
             # Auto-switch backend if needed
-            if model_path.endswith(".gguf"):
-                self.backend_combo.setCurrentIndex(0)  # GGUF backend
-            else:
-                # Find the Transformers backend index
-                for i in range(self.backend_combo.count()):
-                    if "Transformers" in self.backend_combo.itemText(i):
-                        self.backend_combo.setCurrentIndex(i)
-                        break
+            is_gguf = model_path.lower().endswith(".gguf")
+            self.backend_combo.setCurrentIndex(self.BACKEND_GGUF_IDX if is_gguf else self.BACKEND_HF_IDX)
         else:
             QMessageBox.critical(
                 self, "Download Failed", "Failed to download the model. Please check your internet connection and try again."
@@ -812,17 +1190,20 @@ class TranslatorMainWindow(QMainWindow):
         last_model = self.settings.value("lastModel", "")
         if last_model and os.path.exists(last_model):
             # If current backend is llama.cpp and saved path is BF16 GGUF, do not auto-enable load
-            if (
-                self.backend_combo.currentIndex() == 0
-                and last_model.lower().endswith(".gguf")
-                and "bf16" in os.path.basename(last_model).lower()
-            ):
+            last_model_lower = last_model.lower()
+            is_bf16_gguf = last_model_lower.endswith(".gguf") and "bf16" in os.path.basename(last_model_lower)
+            if is_bf16_gguf and self.backend_combo.currentIndex() == self.BACKEND_GGUF_IDX:
                 self.model_path_label.setText("No model loaded")
                 self.load_button.setEnabled(False)
             else:
                 self.model_path_label.setText(last_model)
                 self.load_button.setEnabled(True)
 
+        # Quantization for the Transformers backend
+        quantization_index = self.quantization_combo.findData(self.settings.value("quantization", "nf4"))
+        if quantization_index >= 0:
+            self.quantization_combo.setCurrentIndex(quantization_index)
+
         # Language preferences
         source_lang = self.settings.value("sourceLang", "English")
         target_lang = self.settings.value("targetLang", "Polish")
@@ -834,30 +1215,49 @@ class TranslatorMainWindow(QMainWindow):
     def find_preferred_model_path(self) -> Optional[str]:
         """Find a preferred GGUF model path under models/"""
         try:
-            preferred = os.path.abspath(os.path.join("models", "Seed-X-PPO-7B-q4_k_m.gguf"))
-            if os.path.exists(preferred) and os.path.getsize(preferred) > 1024:
-                return preferred
-            candidates = []
-            for root, _, files in os.walk("models"):
-                for f in files:
-                    if f.lower().endswith(".gguf") and "bf16" not in f.lower():
-                        full = os.path.abspath(os.path.join(root, f))
-                        try:
-                            size = os.path.getsize(full)
-                        except Exception:
-                            size = 0
-                        candidates.append((size, full))
-            if candidates:
-                candidates.sort(reverse=True)  # largest first
-                return candidates[0][1]
+            models_dir = os.path.abspath("models")  # Scanning an absolute root yields absolute entry paths
+            preferred = os.path.join(models_dir, "Seed-X-PPO-7B-q4_k_m.gguf")
+            try:
+                if os.stat(preferred).st_size > 1024:  # One stat answers both "exists" and "big enough"
+                    return preferred
+            except OSError:
+                pass
+            # Most installs keep GGUFs directly in models/, so only descend when that level has none
+            subdirs = []
+            best = max(_scan_gguf(models_dir, subdirs), default=None)  # Largest (size, path), kept as a running max
+            if best is None:
+                best = max(chain.from_iterable(_scan_gguf(subdir) for subdir in subdirs), default=None)
+            if best is not None:
+                return best[1]
         except Exception:
             pass
         return None
 
+    def _find_model_path_cached(self) -> Optional[str]:
+        """Return the last scan result while models/ is unchanged, otherwise rescan and remember it"""
+        try:
+            models_mtime = str(os.stat("models").st_mtime_ns)
+        except OSError:
+            return None  # No models/ directory, nothing to scan
+
+        # Result of an earlier call in this process, including "nothing found"
+        if self._model_path_cache is not None and self._model_path_cache[0] == models_mtime:
+            return self._model_path_cache[1]
+
+        cached = self.settings.value("modelsScanResult", "")
+        if cached and self.settings.value("modelsDirMtime", "") == models_mtime and os.path.exists(cached):
+            path = cached
+        else:
+            path = self.find_preferred_model_path()
+            self.settings.setValue("modelsDirMtime", models_mtime)
+            self.settings.setValue("modelsScanResult", path or "")
+        self._model_path_cache = (models_mtime, path)
+        return path
+
     def try_autoload_model(self):
         """Auto-detect and load a model on startup"""
         if self.model_path_label.text() == "No model loaded":
-            path = self.find_preferred_model_path()
+            path = self._find_model_path_cached()
             if path:
                 self.model_path_label.setText(path)
                 self.load_button.setEnabled(True)
@@ -871,14 +1271,18 @@ class TranslatorMainWindow(QMainWindow):
         if self.model_path_label.text() != "No model loaded":
             self.settings.setValue("lastModel", self.model_path_label.text())
 
+        self.settings.setValue("quantization", self.quantization_combo.currentData())
         self.settings.setValue("sourceLang", self.source_lang.text())
         self.settings.setValue("targetLang", self.target_lang.text())
 
     def closeEvent(self, event):
         """Handle application close event"""
         self.save_settings()
+        self.settings.sync()
 
-        if self.manager.is_model_loaded():
+        if self.manager is None:
+            event.accept()
+        elif self.manager.is_model_loaded():
             reply = QMessageBox.question(
                 self,
                 "Confirm Exit",
@@ -888,11 +1292,13 @@ class TranslatorMainWindow(QMainWindow):
             )
 
             if reply == QMessageBox.StandardButton.Yes:
+                self.manager.shutdown()
                 self.manager.unload_model()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self.manager.shutdown()
             event.accept()
 
 
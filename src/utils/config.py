@@ -2,80 +2,147 @@
 Configuration settings for the Seed-X Translation application
 """
 
+import functools
+from dataclasses import dataclass, fields, replace
+from types import MappingProxyType
+from typing import Any, Dict, Tuple
+
 # Model settings
 DEFAULT_MODEL_PATH = "models/"
 DEFAULT_MODEL_NAME = "seed-x-ppo-7b.gguf"
 
-# Model parameters
-MODEL_CONFIG = {
-    "n_ctx": 2048,  # Context window size
-    "n_threads": 8,  # Number of CPU threads
-    "n_gpu_layers": -1,  # -1 = all layers on GPU, 0 = all on CPU
-    "seed": -1,  # Random seed (-1 for random)
-    "verbose": False,  # Print verbose output
-}
-
-# Generation parameters
-GENERATION_CONFIG = {
-    "max_tokens": 512,
-    "temperature": 0.1,
-    "top_p": 0.95,
-    "top_k": 40,
-    "repeat_penalty": 1.1,
-    "stop": ["</s>", "\n\n"],
-}
-
-# Supported languages
-LANGUAGES = {
-    "Arabic": "ar",
-    "Czech": "cs",
-    "Danish": "da",
-    "German": "de",
-    "English": "en",
-    "Spanish": "es",
-    "Finnish": "fi",
-    "French": "fr",
-    "Croatian": "hr",
-    "Hungarian": "hu",
-    "Indonesian": "id",
-    "Italian": "it",
-    "Japanese": "ja",
-    "Korean": "ko",
-    "Malay": "ms",
-    "Norwegian Bokmål": "nb",
-    "Dutch": "nl",
-    "Norwegian": "no",
-    "Polish": "pl",
-    "Portuguese": "pt",
-    "Romanian": "ro",
-    "Russian": "ru",
-    "Swedish": "sv",
-    "Thai": "th",
-    "Turkish": "tr",
-    "Ukrainian": "uk",
-    "Vietnamese": "vi",
-    "Chinese": "zh",
-}
+# Model parameters (read-only; build a new dict with {**MODEL_CONFIG, ...} to override)
+MODEL_CONFIG = MappingProxyType(
+    {
+        "n_ctx": 2048,  # Context window size
+        "n_threads": 8,  # Number of CPU threads
+        "n_gpu_layers": -1,  # -1 = all layers on GPU (capped to free VRAM when pynvml is installed), 0 = all on CPU
+        "n_batch": 512,  # Prompt tokens processed per batch during prefill
+        "use_mmap": True,  # Memory-map the weights instead of reading them into RAM
+        "use_mlock": False,  # Pin weights in RAM (needs enough free memory for the whole model)
+        "offload_kqv": True,  # Keep the KV cache on the GPU
+        "flash_attn": True,  # Use flash attention when the build supports it
+        "seed": -1,  # Random seed (-1 for random)
+        "verbose": False,  # Print verbose output
+    }
+)
+
+# Generation parameters (read-only)
+GENERATION_CONFIG = MappingProxyType(
+    {
+        "max_tokens": 512,
+        "temperature": 0.1,
+        "top_p": 0.95,
+        "top_k": 40,
+        "repeat_penalty": 1.1,
+        "stop": ("</s>", "\n\n"),
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class GenParams:
+    """Resolved generation parameters, built once per settings change"""
+
+    max_tokens: int = 512
+    temperature: float = 0.1
+    top_p: float = 0.95
+    top_k: int = 40
+    repeat_penalty: float = 1.1
+    stop: Tuple[str, ...] = ("</s>", "\n\n")
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "GenParams":
+        """Build from a settings dict such as GENERATION_CONFIG, ignoring unknown keys"""
+        params = {f.name: settings[f.name] for f in fields(cls) if f.name in settings}
+        if "stop" in params:
+            params["stop"] = tuple(params["stop"])
+        return cls(**params)
+
+    def merged(self, overrides: Dict[str, Any]) -> "GenParams":
+        """Return a copy with per-call overrides applied, ignoring unknown keys"""
+        params = {f.name: overrides[f.name] for f in fields(self) if f.name in overrides}
+        if not params:
+            return self
+        if "stop" in params:
+            params["stop"] = tuple(params["stop"])
+        return replace(self, **params)
+
+
+# Supported languages, in display order
+_LANG_ITEMS = (
+    ("Arabic", "ar"),
+    ("Czech", "cs"),
+    ("Danish", "da"),
+    ("German", "de"),
+    ("English", "en"),
+    ("Spanish", "es"),
+    ("Finnish", "fi"),
+    ("French", "fr"),
+    ("Croatian", "hr"),
+    ("Hungarian", "hu"),
+    ("Indonesian", "id"),
+    ("Italian", "it"),
+    ("Japanese", "ja"),
+    ("Korean", "ko"),
+    ("Malay", "ms"),
+    ("Norwegian Bokmål", "nb"),
+    ("Dutch", "nl"),
+    ("Norwegian", "no"),
+    ("Polish", "pl"),
+    ("Portuguese", "pt"),
+    ("Romanian", "ro"),
+    ("Russian", "ru"),
+    ("Swedish", "sv"),
+    ("Thai", "th"),
+    ("Turkish", "tr"),
+    ("Ukrainian", "uk"),
+    ("Vietnamese", "vi"),
+    ("Chinese", "zh"),
+)
+LANGUAGES = MappingProxyType(dict(_LANG_ITEMS))  # Read-only name -> code view
+LANG_NAMES = tuple(name for name, _ in _LANG_ITEMS)
+
+# Reverse lookups for LANGUAGES (built once at import)
+LANGUAGE_CODE_BY_NAME = {name.lower(): code for name, code in _LANG_ITEMS}
+LANGUAGE_NAME_BY_CODE = {code: name for name, code in _LANG_ITEMS}
 
 # UI Configuration
-UI_CONFIG = {"window_width": 1200, "window_height": 700, "font_size": 11, "max_history": 100}
-
-# Application themes
-THEMES = {
-    "light": {
-        "bg": "#f0f0f0",
-        "fg": "#000000",
-        "input_bg": "#ffffff",
-        "output_bg": "#f8f8f8",
-        "button_bg": "#0084ff",
-        "button_fg": "#ffffff",
-    },
-    "dark": {
-        "bg": "#2b2b2b",
-        "fg": "#ffffff",
-        "input_bg": "#3c3c3c",
-        "output_bg": "#404040",
-        "button_bg": "#0084ff",
-        "button_fg": "#ffffff",
-    },
-}
+UI_CONFIG = MappingProxyType({"window_width": 1200, "window_height": 700, "font_size": 11, "max_history": 100})
+
+
+# Application themes (read-only, including each theme), built on first access through __getattr__
+@functools.cache
+def _build_themes() -> MappingProxyType:
+    """Return the read-only theme table"""
+    return MappingProxyType(
+        {
+            "light": MappingProxyType(
+                {
+                    "bg": "#f0f0f0",
+                    "fg": "#000000",
+                    "input_bg": "#ffffff",
+                    "output_bg": "#f8f8f8",
+                    "button_bg": "#0084ff",
+                    "button_fg": "#ffffff",
+                }
+            ),
+            "dark": MappingProxyType(
+                {
+                    "bg": "#2b2b2b",
+                    "fg": "#ffffff",
+                    "input_bg": "#3c3c3c",
+                    "output_bg": "#404040",
+                    "button_bg": "#0084ff",
+                    "button_fg": "#ffffff",
+                }
+            ),
+        }
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """Build rarely used constants on first access (PEP 562)"""
+    if name == "THEMES":
+        return _build_themes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,8 +2,115 @@
 Download missing tokenizer files for Seed-X-PPO-7B model
 """
 
+import hashlib
+import importlib.util
 import os
-from huggingface_hub import hf_hub_download
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Set, Tuple
+
+# hf_transfer fetches large files as parallel byte ranges; huggingface_hub reads this flag at import time
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+from huggingface_hub import HfApi, hf_hub_download  # noqa: E402
+
+# Upper bound on files fetched at the same time
+MAX_PARALLEL_DOWNLOADS = 8
+
+
+def _git_blob_sha1(path: str) -> str:
+    """Return the git blob id of a file, which the Hub reports for files not stored in LFS"""
+    digest = hashlib.sha1(f"blob {os.path.getsize(path)}\0".encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_intact(local_path: str, info) -> bool:
+    """Compare a downloaded file against the size and checksum listed on the Hub"""
+    if info is None:
+        return True  # Nothing to compare against
+    if os.path.getsize(local_path) != info.size:
+        return False
+    if info.lfs is None:
+        # Small git-stored files (tokenizer, configs) are cheap to hash; LFS weights are checked by size only
+        return _git_blob_sha1(local_path) == info.blob_id
+    return True
+
+
+def _download_file(repo_id: str, filename: str, model_dir: str, info=None, revision: Optional[str] = None) -> str:
+    """Download one file into model_dir, retrying once if it does not match the Hub copy, and return its name"""
+    for attempt in range(2):
+        print(f"Downloading {filename} from {repo_id}...")
+        local_path = hf_hub_download(
+            repo_id=repo_id,
+            filename=filename,
+            revision=revision,
+            local_dir=model_dir,
+            local_dir_use_symlinks=False,
+            force_download=attempt > 0,
+        )
+        if _is_intact(local_path, info):
+            return filename
+        print(f"{filename} does not match the Hub copy, removing it")
+        os.remove(local_path)
+    raise RuntimeError(f"{filename} is still incomplete after a second download")
+
+
+def _resolve_repo(api: HfApi, repo_id: str) -> Tuple[Optional[str], Optional[Set[str]]]:
+    """Return the current commit of a repo and the files in it, or (None, None) if the Hub cannot be reached"""
+    try:
+        revision = api.repo_info(repo_id).sha
+        return revision, set(api.list_repo_files(repo_id, revision=revision))
+    except Exception as e:
+        print(f"Could not list files in {repo_id}: {e}")
+        return None, None
+
+
+def _remote_file_info(api: HfApi, repo_id: str, filenames: list, revision: Optional[str] = None) -> dict:
+    """Return Hub file metadata keyed by path, or an empty dict if it cannot be fetched"""
+    try:
+        infos = api.get_paths_info(repo_id, filenames, revision=revision)
+    except Exception as e:
+        print(f"Could not fetch file metadata, skipping integrity checks: {e}")
+        return {}
+    return {info.path: info for info in infos if hasattr(info, "size")}
+
+
+def _download_all(repo_id: str, filenames: list, model_dir: str):
+    """Download the given files from one pinned commit of repo_id, several at a time"""
+    # Resolve the commit once, so every download below fetches from the same snapshot
+    api = HfApi()
+    revision, repo_files = _resolve_repo(api, repo_id)
+    if repo_files is not None:
+        for filename in filenames:
+            if filename not in repo_files:
+                print(f"Not in {repo_id}, skipping: {filename}")
+        filenames = [filename for filename in filenames if filename in repo_files]
+    if not filenames:
+        return
+
+    # Each file is its own request, so fetch them side by side instead of one after another
+    remote_info = _remote_file_info(api, repo_id, filenames, revision)
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_DOWNLOADS, len(filenames))) as executor:
+        futures = {
+            executor.submit(_download_file, repo_id, filename, model_dir, remote_info.get(filename), revision): filename
+            for filename in filenames
+        }
+        try:
+            for future in as_completed(futures):
+                filename = futures[future]
+                try:
+                    future.result()
+                    print(f"Downloaded: {filename}")
+                except Exception as e:
+                    print(f"Failed to download {filename}: {e}")
+        except KeyboardInterrupt:
+            # Drop queued downloads; the ones already running finish before the executor exits
+            print("\nInterrupted, cancelling pending downloads...")
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
 
 
 def download_missing_files():
@@ -23,19 +130,23 @@ def download_missing_files():
 
     print(f"Checking model directory: {model_dir}")
 
+    # One directory listing instead of a stat per required file
+    existing = set()
+    if os.path.isdir(model_dir):
+        with os.scandir(model_dir) as it:
+            existing = {entry.name for entry in it}
+
+    missing_files = []
     for filename in required_files:
-        file_path = os.path.join(model_dir, filename)
-        if not os.path.exists(file_path):
+        if filename not in existing:
             print(f"Missing file: {filename}")
-            try:
-                print(f"Downloading {filename} from {repo_id}...")
-                hf_hub_download(repo_id=repo_id, filename=filename, local_dir=model_dir, local_dir_use_symlinks=False)
-                print(f"Downloaded: {filename}")
-            except Exception as e:
-                print(f"Failed to download {filename}: {e}")
+            missing_files.append(filename)
         else:
             print(f"File exists: {filename}")
 
+    if missing_files:
+        _download_all(repo_id, missing_files, model_dir)
+
     print("\nDownload complete!")
 
 
@@ -0,0 +1,41 @@
+"""
+Tests for FilterableComboBox item sharing
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from src.gui.filterable_combobox import FilterableComboBox  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def test_share_keeps_popup_model_on_installed_completer(qapp):
+    a = FilterableComboBox()
+    a.addItems(["English", "Polish"])
+    b = FilterableComboBox()
+    b._ensure_completer()
+    b.share_items(a)
+    assert b.model() is a.source_model
+    assert b.completer_.model() is b._popup_model
+
+
+def test_add_items_after_share_keeps_popup_model(qapp):
+    a = FilterableComboBox()
+    a.addItems(["English", "Polish"])
+    b = FilterableComboBox()
+    b.share_items(a)
+    b._ensure_completer()
+    b.addItems(["German", "French"])
+    assert b.source_model is not a.source_model
+    assert b.completer_.model() is b._popup_model
+    assert a.source_model.stringList() == ["English", "Polish"]
@@ -0,0 +1,53 @@
+"""
+Tests for the Transformers handler's output post-processing
+"""
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from src.backend.model_handler_transformers import TransformersTranslationModel  # noqa: E402
+from src.utils.config import GENERATION_CONFIG, GenParams  # noqa: E402
+
+
+@pytest.fixture
+def handler():
+    # Extraction needs no loaded model, so skip __init__ and its device probing
+    model = TransformersTranslationModel.__new__(TransformersTranslationModel)
+    model.tokenizer = None
+    return model
+
+
+def _stop_strings(handler, texts, use_cot):
+    criteria = handler._stopping_criteria(0, GenParams.from_settings(GENERATION_CONFIG), texts, use_cot)
+    return criteria[0].stop
+
+
+def test_tagged_marker_wins_over_earlier_bare_marker(handler):
+    output = "Note pl> aside\n<pl>Cześć świecie"
+    assert handler.extract_translation_from_output(output, "pl") == "Cześć świecie"
+
+
+def test_bare_marker_used_when_no_tagged_marker(handler):
+    output = "Translation pl> Cześć świecie"
+    assert handler.extract_translation_from_output(output, "pl") == "Cześć świecie"
+
+
+def test_empty_tagged_segment_falls_back_to_bare_marker(handler):
+    output = "pl> Cześć <pl>   "
+    assert handler.extract_translation_from_output(output, "pl") == "Cześć"
+
+
+def test_blank_line_stops_single_paragraph_translation(handler):
+    assert "\n\n" in _stop_strings(handler, ["Hello world"], use_cot=False)
+
+
+def test_blank_line_does_not_stop_cot(handler):
+    assert "\n\n" not in _stop_strings(handler, ["Hello world"], use_cot=True)
+
+
+def test_blank_line_does_not_stop_multi_paragraph_input(handler):
+    assert "\n\n" not in _stop_strings(handler, ["First paragraph.\n\nSecond paragraph."], use_cot=False)
+    # One multi-paragraph text is enough to keep the whole batch going
+    assert "\n\n" not in _stop_strings(handler, ["Short", "One\n\nTwo"], use_cot=False)
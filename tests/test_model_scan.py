@@ -0,0 +1,54 @@
+"""
+Tests for the GGUF autodetect scan under models/
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from src.gui.translator_app import _scan_gguf  # noqa: E402
+
+
+def _write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+
+
+def test_unreadable_subdirectory_is_skipped(tmp_path):
+    _write(tmp_path / "top.gguf", 10)
+    _write(tmp_path / "ok" / "nested.gguf", 20)
+    locked = tmp_path / "locked"
+    _write(locked / "hidden.gguf", 30)
+    locked.chmod(0)
+    try:
+        if os.access(locked, os.R_OK):
+            pytest.skip("permissions are not enforced for this user")
+        found = sorted(_scan_gguf(str(tmp_path)))
+    finally:
+        locked.chmod(0o755)
+
+    assert found == [(10, str(tmp_path / "top.gguf")), (20, str(tmp_path / "ok" / "nested.gguf"))]
+
+
+def test_vanished_subdirectory_is_skipped(tmp_path, monkeypatch):
+    _write(tmp_path / "top.gguf", 10)
+    gone = tmp_path / "gone"
+    gone.mkdir()
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if os.fspath(path) == str(gone):
+            raise FileNotFoundError(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    assert list(_scan_gguf(str(tmp_path))) == [(10, str(tmp_path / "top.gguf"))]
+
+
+def test_bf16_and_non_gguf_files_are_ignored(tmp_path):
+    _write(tmp_path / "model-bf16.gguf", 50)
+    _write(tmp_path / "notes.txt", 50)
+    _write(tmp_path / "model-q4_k_m.GGUF", 5)
+    assert list(_scan_gguf(str(tmp_path))) == [(5, str(tmp_path / "model-q4_k_m.GGUF"))]